@@ -5,15 +5,118 @@ import os
 # Override database URL before any src modules are imported.
 os.environ["NOTIF_DATABASE_URL"] = "sqlite+aiosqlite://"
 
+from unittest.mock import AsyncMock, Mock
+
 import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+from src.clients.circuit_breaker import reset_breakers
+from src.clients.jira_client import get_jira_client
+from src.clients.slack_client import get_slack_client
 from src.database import engine, Base
+from src.handlers._common import recent_idempotency_keys
+from src.main import app
+from src.schemas.events import PROpenedEvent
+
+_schema_created = False
 
 
 @pytest.fixture(autouse=True)
 async def _reset_db():
-    """Create all tables before each test, drop after."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    """Create the schema once per session, then empty every table after each test."""
+    recent_idempotency_keys.clear()
+    reset_breakers()
+    global _schema_created
+    if not _schema_created:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        _schema_created = True
     yield
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
+        for table in reversed(Base.metadata.sorted_tables):
+            await conn.execute(table.delete())
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client():
+    """One in-process HTTP client for the whole run; ASGITransport holds no sockets."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
+def mocked_clients():
+    """Happy-path Jira and Slack mocks injected into the app's dependencies.
+
+    Yields ``(mock_jira, mock_slack)`` so tests can override return values or
+    side effects before posting.
+    """
+    mock_jira = AsyncMock()
+    mock_jira.create_issue.return_value = {"key": "ACCR-42"}
+    mock_jira.browse_url = Mock(side_effect=lambda key: f"https://yourco.atlassian.net/browse/{key}")
+
+    mock_slack = AsyncMock()
+    mock_slack.send_message.return_value = {"ok": True}
+
+    app.dependency_overrides[get_jira_client] = lambda: mock_jira
+    app.dependency_overrides[get_slack_client] = lambda: mock_slack
+    yield mock_jira, mock_slack
+    app.dependency_overrides.clear()
+
+
+def _sample_notification_bundle(**overrides) -> dict:
+    payload = {
+        "author": "devin",
+        "assertions": {
+            "source_repo": "https://github.com/MadhuvanthiSriPad/api-core",
+            "target_repo": "https://github.com/MadhuvanthiSriPad/billing-service",
+            "target_service": "billing-service",
+            "pr_url": "https://github.com/MadhuvanthiSriPad/billing-service/pull/1",
+        },
+        "jira": {
+            "summary": "Devin-authored Jira summary",
+            "description_text": "Devin-authored Jira description\n\n- check billing gateway\n- verify invoice tests",
+        },
+        "slack": {
+            "text": "Devin-authored Slack text",
+            "blocks": [],
+        },
+    }
+    payload.update(overrides)
+    return payload
+
+
+_EVENT_DEFAULTS = {
+    "event_type": "pr_opened",
+    "change_id": 1,
+    "job_id": 10,
+    "timestamp": "2026-02-28T10:30:00Z",
+    "source_repo": "https://github.com/MadhuvanthiSriPad/api-core",
+    "target_repo": "https://github.com/MadhuvanthiSriPad/billing-service",
+    "target_service": "billing-service",
+    "pr_url": "https://github.com/MadhuvanthiSriPad/billing-service/pull/1",
+    "devin_session_url": "https://app.devin.ai/sessions/sess_1",
+    "severity": "high",
+    "is_breaking": True,
+    "summary": "test change",
+    "changed_routes": ["POST /sessions"],
+}
+
+
+def _sample_event(**overrides) -> PROpenedEvent:
+    # Validated on purpose: overrides such as notification_bundle are plain
+    # dicts that must become models, exactly as in a real webhook.
+    return PROpenedEvent(**{**_EVENT_DEFAULTS, **overrides})
+
+
+@pytest.fixture
+def make_notification_bundle():
+    """Factory for a valid Devin-authored notification bundle dict; keyword overrides replace top-level keys."""
+    return _sample_notification_bundle
+
+
+@pytest.fixture
+def make_pr_opened_event():
+    """Factory for a validated ``PROpenedEvent``; keyword overrides replace fields."""
+    return _sample_event
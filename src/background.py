@@ -0,0 +1,53 @@
+"""Best-effort background work kept off the webhook critical path.
+
+Tasks spawned here must own their error handling — failures are not reported
+back to the webhook caller.  At most ``_MAX_IN_FLIGHT`` of them execute at
+once; the rest wait as pending tasks, so only execution is capped, not the
+number of queued tasks.  Outstanding tasks are drained once at application
+shutdown.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Coroutine
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_MAX_IN_FLIGHT = 32
+
+_semaphore: asyncio.Semaphore | None = None
+_pending: set[asyncio.Task] = set()
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    # Created on first use, inside the running event loop, not at import.
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(_MAX_IN_FLIGHT)
+    return _semaphore
+
+
+async def _bounded(coro: Coroutine[Any, Any, Any]) -> None:
+    async with _get_semaphore():
+        await coro
+
+
+def spawn_background(coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+    """Schedule *coro* without awaiting it; a reference is held until it finishes."""
+    task = asyncio.create_task(_bounded(coro))
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+    return task
+
+
+async def drain_background_tasks() -> None:
+    """Wait for every outstanding background task to finish.
+
+    Loops until none are left, since a task may spawn follow-up work.
+    """
+    while _pending:
+        logger.info("Draining %d background task(s)", len(_pending))
+        await asyncio.gather(*list(_pending), return_exceptions=True)
@@ -0,0 +1,131 @@
+"""Per-downstream circuit breakers for the outbound API clients.
+
+After ``settings.circuit_fail_threshold`` consecutive outage-like failures a
+breaker opens and every call fails immediately with ``CircuitOpenError``
+instead of waiting out the HTTP timeout.  Once
+``settings.circuit_recovery_seconds`` have passed, a single trial call is let
+through (half-open): success closes the breaker, failure re-opens it.
+
+Only failures that indicate the downstream itself is unhealthy — transport
+errors, timeouts, 5xx, 429 and auth rejections — count towards tripping.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Literal, TypeVar
+
+import httpx
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+CircuitState = Literal["closed", "open", "half_open"]
+
+_OUTAGE_STATUS_CODES = {401, 403, 429}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a downstream whose breaker is open."""
+
+
+def _is_outage(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.TransportError):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status >= 500 or status in _OUTAGE_STATUS_CODES
+    return False
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a half-open trial after a cooldown."""
+
+    def __init__(self, name: str, fail_threshold: int = 5, recovery_s: float = 30.0) -> None:
+        self.name = name
+        self._fail_threshold = fail_threshold
+        self._recovery_s = recovery_s
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self._recovery_s:
+            return "half_open"
+        return "open"
+
+    async def call(self, fn: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        """Await ``fn(*args, **kwargs)`` unless the breaker is open."""
+        state = self.state
+        if state == "open" or (state == "half_open" and self._trial_in_flight):
+            raise CircuitOpenError(f"{self.name} circuit open — skipping call")
+        trial = state == "half_open"
+        if trial:
+            self._trial_in_flight = True
+        try:
+            result = await fn(*args, **kwargs)
+        except BaseException as exc:
+            if _is_outage(exc):
+                self._record_failure()
+            elif trial:
+                # Not an outage signal, but the trial proved nothing either.
+                self._opened_at = time.monotonic()
+            raise
+        else:
+            self._record_success()
+            return result
+        finally:
+            if trial:
+                self._trial_in_flight = False
+
+    def _record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("%s circuit closed", self.name)
+        self._failures = 0
+        self._opened_at = None
+
+    def _record_failure(self) -> None:
+        self._failures += 1
+        if self._opened_at is not None or self._failures >= self._fail_threshold:
+            if self._opened_at is None:
+                logger.warning("%s circuit opened after %d failures", self.name, self._failures)
+            self._opened_at = time.monotonic()
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the shared breaker for downstream *name*, creating it on first use."""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            name,
+            fail_threshold=settings.circuit_fail_threshold,
+            recovery_s=settings.circuit_recovery_seconds,
+        )
+        _breakers[name] = breaker
+    return breaker
+
+
+def breaker_states() -> dict[str, CircuitState]:
+    """Current state of every breaker created so far, for the health endpoint."""
+    return {name: breaker.state for name, breaker in _breakers.items()}
+
+
+def reset_breakers() -> None:
+    """Forget all breakers and the cached clients holding them (used by tests)."""
+    # Imported here: the client modules import this one.
+    from src.clients.jira_client import get_jira_client
+    from src.clients.slack_client import get_slack_client
+
+    _breakers.clear()
+    get_jira_client.cache_clear()
+    get_slack_client.cache_clear()
@@ -0,0 +1,56 @@
+"""Process-wide pooled httpx clients shared by the outbound API clients.
+
+Each downstream service gets one long-lived ``httpx.AsyncClient`` so that
+keep-alive connections (and their TLS sessions) are reused across webhooks
+instead of being rebuilt per request.  Clients are created lazily on first use
+and closed once at application shutdown.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+import httpx
+
+from src.config import HTTP_TIMEOUTS
+
+_DEFAULT_TIMEOUT = httpx.Timeout(connect=2.0, read=10.0, write=5.0, pool=1.0)
+_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=1000, keepalive_expiry=300)
+# Transport-level retries only cover failed connection attempts, so they are
+# safe for non-idempotent POSTs.
+_CONNECT_RETRIES = 2
+
+_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def get_http_client(
+    name: str,
+    *,
+    base_url: str = "",
+    headers: Mapping[str, str] | None = None,
+) -> httpx.AsyncClient:
+    """Return the shared client for *name*, creating it on first use.
+
+    Per-stage timeouts come from ``HTTP_TIMEOUTS[name]`` in ``src.config``.
+    *base_url* and *headers* are attached once at construction.  Clients speak
+    HTTP/2 where the server supports it, so concurrent webhooks multiplex over
+    one connection instead of opening a TLS session each.
+    """
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=HTTP_TIMEOUTS.get(name, _DEFAULT_TIMEOUT),
+            transport=httpx.AsyncHTTPTransport(http2=True, limits=_LIMITS, retries=_CONNECT_RETRIES),
+        )
+        _clients[name] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close every shared client — called once from the app lifespan."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
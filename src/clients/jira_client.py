@@ -2,56 +2,123 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import logging
+from functools import lru_cache
+from types import MappingProxyType
 
 import httpx
+import orjson
 
+from src.clients.circuit_breaker import get_breaker
+from src.clients.http_pool import get_http_client
 from src.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Credentials never change at runtime, so the Basic-auth header is encoded once
+# at import and attached to the shared httpx client rather than per request.
+_header_values = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+}
+if settings.jira_api_token:
+    _credentials = base64.b64encode(
+        f"{settings.jira_user_email}:{settings.jira_api_token}".encode()
+    ).decode()
+    _header_values["Authorization"] = f"Basic {_credentials}"
+_HEADERS = MappingProxyType(_header_values)
+
 
 class JiraClient:
     """Create issues via Jira Cloud REST API v3."""
 
-    def __init__(self) -> None:
-        if not settings.jira_base_url or not settings.jira_api_token:
-            raise RuntimeError("Jira not configured — set NOTIF_JIRA_BASE_URL and NOTIF_JIRA_API_TOKEN")
-        credentials = base64.b64encode(
-            f"{settings.jira_user_email}:{settings.jira_api_token}".encode()
-        ).decode()
+    def __init__(self, http: httpx.AsyncClient | None = None) -> None:
+        """*http* overrides the shared pooled client; it must carry the Jira headers.
+
+        Construction never fails; a missing configuration is reported when the
+        client is first used, so one process-wide instance can always exist.
+        """
         self._base_url = settings.jira_base_url.rstrip("/")
-        self._headers = {
-            "Authorization": f"Basic {credentials}",
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
-        self._client = httpx.AsyncClient(timeout=15.0)
+        self._configured = bool(self._base_url and settings.jira_api_token)
+        self._client = http or get_http_client("jira", headers=_HEADERS)
+        self._breaker = get_breaker("jira")
+        # Shared by every webhook using this (process-wide) client, so a burst
+        # queues here instead of piling requests onto Jira.
+        self._in_flight = asyncio.Semaphore(settings.jira_max_in_flight)
+
+    def _require_configured(self) -> None:
+        if not self._configured:
+            raise RuntimeError("Jira not configured — set NOTIF_JIRA_BASE_URL and NOTIF_JIRA_API_TOKEN")
+
+    async def _post(self, url: str, content: bytes) -> httpx.Response:
+        """POST through the Jira circuit breaker; raises on non-2xx responses."""
+
+        async def _send() -> httpx.Response:
+            async with self._in_flight:
+                resp = await self._client.post(url, content=content)
+            resp.raise_for_status()
+            return resp
+
+        return await self._breaker.call(_send)
 
     async def create_issue(self, fields: dict) -> dict:
         """Create a Jira issue and return the response JSON.
 
         Returns dict with at least 'key' and 'self' on success.
         """
+        self._require_configured()
         url = f"{self._base_url}/rest/api/3/issue"
         payload = {"fields": fields}
-        resp = await self._client.post(url, json=payload, headers=self._headers)
-        resp.raise_for_status()
-        data = resp.json()
+        resp = await self._post(url, orjson.dumps(payload))
+        data = orjson.loads(resp.content)
         logger.info("Jira issue created: %s", data.get("key"))
         return data
 
     async def add_comment(self, issue_key: str, body_doc: dict) -> dict:
         """Add an ADF comment to an existing Jira issue."""
+        self._require_configured()
         url = f"{self._base_url}/rest/api/3/issue/{issue_key}/comment"
-        resp = await self._client.post(url, json={"body": body_doc}, headers=self._headers)
-        resp.raise_for_status()
+        resp = await self._post(url, orjson.dumps({"body": body_doc}))
         logger.info("Jira comment added to %s", issue_key)
-        return resp.json()
+        return orjson.loads(resp.content)
+
+    async def add_comments(self, issue_keys: list[str], body_doc: dict) -> dict[str, Exception | None]:
+        """Add the same ADF comment to several issues.
+
+        Jira Cloud has no bulk-comment endpoint, so this is one request per
+        issue, serialized once and sent ``settings.jira_max_concurrency`` at a
+        time.  Returns each issue key mapped to its error, or None on success.
+        """
+        self._require_configured()
+        content = orjson.dumps({"body": body_doc})
+        sem = asyncio.Semaphore(settings.jira_max_concurrency)
+
+        async def _post(issue_key: str) -> Exception | None:
+            url = f"{self._base_url}/rest/api/3/issue/{issue_key}/comment"
+            async with sem:
+                try:
+                    await self._post(url, content)
+                except Exception as exc:
+                    return exc
+            logger.info("Jira comment added to %s", issue_key)
+            return None
+
+        outcomes = await asyncio.gather(*(_post(key) for key in issue_keys))
+        return dict(zip(issue_keys, outcomes))
+
+    async def warm_up(self) -> None:
+        """Open a pooled connection ahead of the first real request."""
+        self._require_configured()
+        resp = await self._client.get(f"{self._base_url}/rest/api/3/myself")
+        resp.raise_for_status()
 
     def browse_url(self, issue_key: str) -> str:
         return f"{self._base_url}/browse/{issue_key}"
 
-    async def close(self) -> None:
-        await self._client.aclose()
+
+@lru_cache(maxsize=1)
+def get_jira_client() -> JiraClient:
+    """Process-wide JiraClient, injected into routes with ``Depends``."""
+    return JiraClient()
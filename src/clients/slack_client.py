@@ -2,55 +2,95 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from functools import lru_cache
 
 import httpx
+import orjson
 
+from src.clients.circuit_breaker import get_breaker
+from src.clients.http_pool import get_http_client
 from src.config import settings
 
 logger = logging.getLogger(__name__)
 
-_SLACK_POST_MESSAGE = "https://slack.com/api/chat.postMessage"
+_SLACK_BASE_URL = "https://slack.com"
+_SLACK_POST_MESSAGE = "/api/chat.postMessage"
+_SLACK_UPDATE_MESSAGE = "/api/chat.update"
+_SLACK_AUTH_TEST = "/api/auth.test"
+_SLACK_MAX_BLOCKS = 50
+_DEFAULT_TEXT = "Remediation PR notification"
+
+
+def _blocks_look_valid(blocks: list[dict]) -> bool:
+    """Cheap local check for payloads Slack would reject as invalid_blocks."""
+    return len(blocks) <= _SLACK_MAX_BLOCKS and all(
+        isinstance(block, dict) and isinstance(block.get("type"), str)
+        for block in blocks
+    )
 
 
 class SlackClient:
     """Send messages via Slack Web API."""
 
-    def __init__(self) -> None:
-        if not settings.slack_bot_token or not settings.slack_channel:
-            raise RuntimeError("Slack not configured — set NOTIF_SLACK_BOT_TOKEN and NOTIF_SLACK_CHANNEL")
+    def __init__(self, http: httpx.AsyncClient | None = None) -> None:
+        """*http* overrides the shared pooled client; it must use the Slack base URL.
+
+        Construction never fails; a missing configuration is reported when the
+        client is first used, so one process-wide instance can always exist.
+        """
+        self._configured = bool(settings.slack_bot_token and settings.slack_channel)
         self._headers = {
             "Authorization": f"Bearer {settings.slack_bot_token}",
             "Content-Type": "application/json; charset=utf-8",
         }
         self._channel = settings.slack_channel
-        self._client = httpx.AsyncClient(timeout=10.0)
+        self._client = http or get_http_client("slack", base_url=_SLACK_BASE_URL)
+        self._breaker = get_breaker("slack")
+        # Shared by every webhook using this (process-wide) client.
+        self._in_flight = asyncio.Semaphore(settings.slack_max_in_flight)
+
+    async def _post(self, payload: dict, url: str = _SLACK_POST_MESSAGE) -> dict:
+        """Send one Slack Web API request through the circuit breaker and return the response JSON."""
+        if not self._configured:
+            raise RuntimeError("Slack not configured — set NOTIF_SLACK_BOT_TOKEN and NOTIF_SLACK_CHANNEL")
+        content = orjson.dumps(payload)
 
-    async def _post(self, payload: dict) -> dict:
-        """Send one chat.postMessage request and return the response JSON."""
-        resp = await self._client.post(
-            _SLACK_POST_MESSAGE, json=payload, headers=self._headers
-        )
-        resp.raise_for_status()
-        return resp.json()
+        async def _send() -> httpx.Response:
+            async with self._in_flight:
+                resp = await self._client.post(url, content=content, headers=self._headers)
+            resp.raise_for_status()
+            return resp
+
+        resp = await self._breaker.call(_send)
+        return orjson.loads(resp.content)
+
+    async def warm_up(self) -> None:
+        """Open a pooled connection ahead of the first real request."""
+        await self._post({}, _SLACK_AUTH_TEST)
 
     async def send_message(self, blocks: list[dict] | None = None, text: str = "") -> dict:
-        """Post a message to the configured channel."""
-        payload = {
-            "channel": self._channel,
-            "text": text or "Remediation PR notification",
-        }
+        """Post a message to the configured channel.
+
+        Blocks and the plain-text fallback travel in one request.  Blocks that
+        fail the local sanity check are dropped up front; blocks Slack still
+        rejects as ``invalid_blocks`` (oversized text, a bad field shape) are
+        retried once as a text-only message.
+        """
+        text_payload = {"channel": self._channel, "text": text or _DEFAULT_TEXT}
+        payload = text_payload
         if blocks:
-            payload["blocks"] = blocks
+            if _blocks_look_valid(blocks):
+                payload = {**text_payload, "blocks": blocks}
+            else:
+                logger.warning("Dropping malformed Slack blocks; sending text-only fallback")
 
         data = await self._post(payload)
         error_code = data.get("error", "unknown_error")
-        if not data.get("ok") and blocks and error_code == "invalid_blocks":
+        if not data.get("ok") and payload is not text_payload and error_code == "invalid_blocks":
             logger.warning("Slack rejected blocks; retrying with text-only fallback")
-            data = await self._post({
-                "channel": self._channel,
-                "text": text or "Remediation PR notification",
-            })
+            data = await self._post(text_payload)
             error_code = data.get("error", error_code)
 
         if not data.get("ok"):
@@ -59,5 +99,31 @@ class SlackClient:
         logger.info("Slack message sent to %s", self._channel)
         return data
 
-    async def close(self) -> None:
-        await self._client.aclose()
+    async def update_message(
+        self,
+        channel: str,
+        ts: str,
+        blocks: list[dict] | None = None,
+        text: str = "",
+    ) -> dict:
+        """Replace the content of a previously posted message (chat.update)."""
+        payload = {
+            "channel": channel,
+            "ts": ts,
+            "text": text or _DEFAULT_TEXT,
+        }
+        if blocks:
+            payload["blocks"] = blocks
+
+        data = await self._post(payload, _SLACK_UPDATE_MESSAGE)
+        if not data.get("ok"):
+            error_code = data.get("error", "unknown_error")
+            logger.error("Slack API error on update: %s", error_code)
+            raise RuntimeError(f"Slack API error: {error_code}")
+        return data
+
+
+@lru_cache(maxsize=1)
+def get_slack_client() -> SlackClient:
+    """Process-wide SlackClient, injected into routes with ``Depends``."""
+    return SlackClient()
@@ -2,7 +2,8 @@
 
 import json
 
-from pydantic import field_validator
+import httpx
+from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
 
 
@@ -18,14 +19,51 @@ class Settings(BaseSettings):
     jira_project_key: str = "AC"
     jira_project_keys_by_repo: dict[str, str] = {}
     jira_assignee_account_id: str = ""
+    # Upper bound on concurrent Jira requests fanned out by a single webhook
+    jira_max_concurrency: int = Field(default=8, gt=0)
+    # Upper bound on Jira requests in flight across all webhooks in the process
+    jira_max_in_flight: int = Field(default=32, gt=0)
 
     # Slack
     slack_bot_token: str = ""
     slack_channel: str = ""
+    # Upper bound on Slack requests in flight across all webhooks in the process
+    slack_max_in_flight: int = Field(default=32, gt=0)
 
     # Billing service — used to enrich post-incident reports with platform cost data
     billing_url: str = ""
 
+    # Acknowledge pr-opened webhooks once the idempotency key is claimed and
+    # deliver to Jira/Slack in the background. Responses then report
+    # "accepted" instead of the delivery outcome. Off by default: an event
+    # accepted just before a crash or redeploy is never delivered, and the
+    # sender's retries are deduplicated away.
+    async_pr_opened: bool = False
+
+    # Jira/Slack deliveries in flight at once for one pr-opened batch request
+    webhook_batch_concurrency: int = Field(default=8, gt=0)
+    # Longest line accepted in an NDJSON webhook body; longer lines are
+    # reported as failed without being buffered
+    ndjson_max_line_bytes: int = Field(default=1_048_576, gt=0)
+
+    # Stored webhook payloads are truncated to this many characters; the
+    # SHA-256 of the full payload is kept alongside for auditing
+    payload_json_max_length: int = Field(default=16_384, gt=0)
+
+    # Circuit breakers: consecutive downstream failures before failing fast,
+    # and seconds to wait before letting a trial request through
+    circuit_fail_threshold: int = Field(default=5, gt=0)
+    circuit_recovery_seconds: float = Field(default=30.0, gt=0)
+
+    # Outbound HTTP timeouts (seconds), split per stage so a stalled TLS
+    # handshake fails fast instead of consuming the whole read budget
+    http_connect_timeout: float = 2.0
+    http_write_timeout: float = 5.0
+    http_pool_timeout: float = 1.0
+    jira_read_timeout: float = 15.0
+    slack_read_timeout: float = 10.0
+    billing_read_timeout: float = 10.0
+
     model_config = {"env_prefix": "NOTIF_"}
 
     @field_validator("jira_project_keys_by_repo", mode="before")
@@ -41,3 +79,19 @@ class Settings(BaseSettings):
 
 
 settings = Settings()
+
+
+def _stage_timeout(read: float) -> httpx.Timeout:
+    return httpx.Timeout(
+        connect=settings.http_connect_timeout,
+        read=read,
+        write=settings.http_write_timeout,
+        pool=settings.http_pool_timeout,
+    )
+
+
+HTTP_TIMEOUTS: dict[str, httpx.Timeout] = {
+    "jira": _stage_timeout(settings.jira_read_timeout),
+    "slack": _stage_timeout(settings.slack_read_timeout),
+    "billing": _stage_timeout(settings.billing_read_timeout),
+}
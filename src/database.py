@@ -6,6 +6,7 @@ from pathlib import Path
 from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import StaticPool
 
 from src.config import settings
 
@@ -23,28 +24,58 @@ def _ensure_sqlite_directory(database_url: str) -> None:
         db_file.parent.mkdir(parents=True, exist_ok=True)
 
 
+_IN_MEMORY_SQLITE_URLS = {"sqlite+aiosqlite://", "sqlite+aiosqlite:///:memory:"}
+_is_sqlite_file = (
+    "sqlite" in settings.database_url
+    and settings.database_url not in _IN_MEMORY_SQLITE_URLS
+)
+
 _ensure_sqlite_directory(settings.database_url)
 
-if "sqlite" in settings.database_url:
+if settings.database_url in _IN_MEMORY_SQLITE_URLS:
+    # An in-memory database lives and dies with its connection, so pin every
+    # session to one shared connection.
+    engine = create_async_engine(
+        settings.database_url,
+        echo=settings.debug,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+elif _is_sqlite_file:
     engine = create_async_engine(
         settings.database_url,
         echo=settings.debug,
         connect_args={"timeout": 30},
     )
+elif "+asyncpg" in settings.database_url:
+    # Keep asyncpg's per-connection prepared-statement cache large enough for
+    # every statement the handlers issue, so hot queries skip server parsing.
+    engine = create_async_engine(
+        settings.database_url,
+        echo=settings.debug,
+        pool_pre_ping=True,
+        connect_args={"prepared_statement_cache_size": 500},
+    )
 else:
     engine = create_async_engine(settings.database_url, echo=settings.debug)
 
 if "sqlite" in settings.database_url:
+    # Per-connection settings only; WAL mode persists in the database file and
+    # is enabled once by init_db().
     @event.listens_for(engine.sync_engine, "connect")
     def _set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
         cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA journal_mode=WAL;")
         cursor.execute("PRAGMA synchronous=NORMAL;")
         cursor.execute("PRAGMA busy_timeout=30000;")
         cursor.execute("PRAGMA foreign_keys=ON;")
         cursor.close()
 
-async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+# Handlers write through explicit INSERT/UPDATE statements and never read back
+# their own pending ORM objects, so reads need not flush first.  Code that does
+# read its own writes must call ``await session.flush()`` itself.
+async_session = async_sessionmaker(
+    engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+)
 
 
 class Base(DeclarativeBase):
@@ -56,7 +87,20 @@ async def get_db():
         yield session
 
 
+# Idempotency claims rely on INSERT ... ON CONFLICT DO NOTHING RETURNING,
+# which the handlers build for these dialects only.
+SUPPORTED_DIALECTS = frozenset({"postgresql", "sqlite"})
+
+
 async def init_db():
+    if engine.dialect.name not in SUPPORTED_DIALECTS:
+        raise RuntimeError(
+            f"Unsupported database dialect {engine.dialect.name!r} — "
+            f"NOTIF_DATABASE_URL must use one of: {', '.join(sorted(SUPPORTED_DIALECTS))}"
+        )
+    if _is_sqlite_file:
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("PRAGMA journal_mode=WAL;")
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
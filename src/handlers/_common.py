@@ -0,0 +1,200 @@
+"""Helpers shared by the webhook handlers."""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+
+import httpx
+from pydantic import BaseModel
+from sqlalchemy import bindparam, delete, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.models.notification_event import NotificationEvent
+
+_ERROR_LIMIT = 500
+
+
+def describe_error(exc: BaseException, limit: int = _ERROR_LIMIT) -> str:
+    """Bounded one-line description of *exc* for persistence and responses.
+
+    HTTP status errors are summarised from the status code and URL rather than
+    formatting the full exception.
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        return f"HTTP {exc.response.status_code} from {exc.request.url}"[:limit]
+    return str(exc)[:limit]
+
+
+def payload_columns(event: BaseModel) -> dict[str, str]:
+    """``payload_json``/``payload_sha256`` values for a NotificationEvent row.
+
+    The stored JSON is capped at ``settings.payload_json_max_length``
+    characters; the digest always covers the full payload.
+    """
+    raw = event.model_dump_json()
+    return {
+        "payload_json": raw[: settings.payload_json_max_length],
+        "payload_sha256": hashlib.sha256(raw.encode()).hexdigest(),
+    }
+
+
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def dialect_insert(db: AsyncSession, table):
+    """INSERT construct for the session's dialect, with ``on_conflict_do_nothing``.
+
+    Both SQLite and PostgreSQL support ``INSERT ... ON CONFLICT DO NOTHING
+    RETURNING``, which lets a handler claim an idempotency key atomically.
+    """
+    return _DIALECT_INSERTS[db.bind.dialect.name](table)
+
+
+async def claim_idempotency(
+    db: AsyncSession,
+    key: str,
+    event: BaseModel,
+    *,
+    job_id: int,
+) -> int | None:
+    """Claim *key* with a single INSERT and return the new NotificationEvent id.
+
+    Returns None when the key was already claimed.  The unique index makes the
+    dedup atomic across concurrent deliveries, and no interim flush is needed.
+    """
+    claim = await db.execute(
+        dialect_insert(db, NotificationEvent)
+        .values(
+            idempotency_key=key,
+            event_type=event.event_type,
+            change_id=event.change_id,
+            job_id=job_id,
+            **payload_columns(event),
+        )
+        .on_conflict_do_nothing(index_elements=["idempotency_key"])
+        .returning(NotificationEvent.id)
+    )
+    return claim.scalar_one_or_none()
+
+
+_RELEASE_CLAIM = delete(NotificationEvent).where(NotificationEvent.id == bindparam("record_id"))
+
+
+async def release_claims(db: AsyncSession, claims: list[tuple[str, int]]) -> None:
+    """Undo ``claim_idempotency`` for events that were never sent.
+
+    *claims* are ``(idempotency key, NotificationEvent id)`` pairs.  The rows
+    are deleted in their own transaction, so a retry of those events is
+    delivered rather than answered ``already_processed``.
+    """
+    async with db.begin():
+        # On the connection, as in save_outcomes: one executemany by id.
+        conn = await db.connection()
+        await conn.execute(_RELEASE_CLAIM, [{"record_id": record_id} for _, record_id in claims])
+    for key, _ in claims:
+        recent_idempotency_keys.discard(key)
+
+
+def finalize_status(jira_sent: bool, slack_sent: bool, errors: list[str]) -> str:
+    """Overall webhook status from the per-service outcomes."""
+    if not errors:
+        return "processed"
+    return "partial" if (jira_sent or slack_sent) else "failed"
+
+
+# Built once so every webhook reuses the same statement and compiled-cache entry.
+_SAVE_OUTCOME = (
+    update(NotificationEvent)
+    .where(NotificationEvent.id == bindparam("record_id"))
+    .values(
+        jira_sent=bindparam("new_jira_sent"),
+        jira_error=bindparam("new_jira_error"),
+        slack_sent=bindparam("new_slack_sent"),
+        slack_error=bindparam("new_slack_error"),
+    )
+)
+
+
+def outcome_params(
+    record_id: int,
+    *,
+    jira_sent: bool,
+    jira_error: str | None,
+    slack_sent: bool,
+    slack_error: str | None,
+) -> dict:
+    """Bind parameters for ``_SAVE_OUTCOME``."""
+    return {
+        "record_id": record_id,
+        "new_jira_sent": jira_sent,
+        "new_jira_error": jira_error,
+        "new_slack_sent": slack_sent,
+        "new_slack_error": slack_error,
+    }
+
+
+async def save_outcome(
+    db: AsyncSession,
+    record_id: int,
+    *,
+    jira_sent: bool,
+    jira_error: str | None,
+    slack_sent: bool,
+    slack_error: str | None,
+) -> None:
+    """Persist a claimed event's delivery outcome with one UPDATE by id."""
+    await db.execute(
+        _SAVE_OUTCOME,
+        outcome_params(
+            record_id,
+            jira_sent=jira_sent,
+            jira_error=jira_error,
+            slack_sent=slack_sent,
+            slack_error=slack_error,
+        ),
+    )
+
+
+async def save_outcomes(db: AsyncSession, params: list[dict]) -> None:
+    """Persist several outcomes (built by ``outcome_params``) as one executemany."""
+    # Executed on the connection: a list of parameters through the session
+    # would switch to the ORM's bulk UPDATE-by-primary-key mode.
+    conn = await db.connection()
+    await conn.execute(_SAVE_OUTCOME, params)
+
+
+class RecentKeys:
+    """Bounded LRU set of idempotency keys this process has already claimed.
+
+    A first-level cache in front of the database check: duplicate deliveries
+    seen by this process are rejected without touching SQLite.  It is only an
+    optimisation — the unique index on ``idempotency_key`` stays authoritative.
+    """
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        self._maxsize = maxsize
+        self._keys: OrderedDict[str, None] = OrderedDict()
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._keys:
+            self._keys.move_to_end(key)
+            return True
+        return False
+
+    def add(self, key: str) -> None:
+        self._keys[key] = None
+        self._keys.move_to_end(key)
+        if len(self._keys) > self._maxsize:
+            self._keys.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        self._keys.pop(key, None)
+
+    def clear(self) -> None:
+        self._keys.clear()
+
+
+recent_idempotency_keys = RecentKeys()
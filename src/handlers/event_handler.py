@@ -2,20 +2,39 @@
 
 Idempotent: duplicate webhooks for the same job_id are detected and skipped.
 Graceful degradation: Jira failure does not block Slack, and vice versa.
+Jira and Slack are called concurrently; once both succeed the Slack message
+is updated in place, off the critical path, to link the new Jira ticket.
+With ``settings.async_pr_opened`` the webhook is acknowledged as soon as its
+idempotency key is claimed and delivery continues in the background.
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
-from contextlib import suppress
+import re
+from collections.abc import AsyncIterator
+from typing import NamedTuple
 
-from sqlalchemy import select
+from pydantic import ValidationError
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.background import spawn_background
 from src.clients.jira_client import JiraClient
 from src.clients.slack_client import SlackClient
-from src.models.notification_event import NotificationEvent
+from src.config import settings
+from src.database import async_session
+from src.handlers._common import (
+    claim_idempotency,
+    describe_error,
+    finalize_status,
+    outcome_params,
+    recent_idempotency_keys,
+    release_claims,
+    save_outcome,
+    save_outcomes,
+)
 from src.models.jira_ticket import JiraTicket
 from src.schemas.events import NotificationBundle, PROpenedEvent, WebhookResponse
 from src.templates.jira_templates import build_issue_fields_from_notification_bundle
@@ -28,18 +47,20 @@ from src.templates.slack_templates import (
 logger = logging.getLogger(__name__)
 
 
+# owner/repo, optionally prefixed by github.com/ or an http(s) GitHub URL, with
+# an optional .git suffix and trailing slash.
+_GITHUB_REPO_RE = re.compile(r"^(?:https?://github\.com/|github\.com/)?([^/\s]+/[^/\s]+?)(?:\.git)?/?$")
+
+
 def _normalize_repo_url(raw: str | None) -> str | None:
     if not raw:
         return None
     value = raw.strip()
     if not value:
         return None
-    if value.startswith(("https://github.com/", "http://github.com/")):
-        return value.rstrip("/").removesuffix(".git").replace("http://", "https://", 1)
-    if value.startswith("github.com/"):
-        return f"https://{value.rstrip('/').removesuffix('.git')}"
-    if "/" in value and " " not in value and value.count("/") == 1:
-        return f"https://github.com/{value.rstrip('/').removesuffix('.git')}"
+    match = _GITHUB_REPO_RE.match(value)
+    if match:
+        return f"https://github.com/{match.group(1)}"
     return value
 
 
@@ -71,28 +92,29 @@ def _validate_notification_bundle(
         logger.warning("Ignoring notification bundle for job %d: unexpected author=%s", event.job_id, bundle.author)
         return None
 
-    asserted_source = bundle.assertions.source_repo or event.source_repo
-    if _repo_name(asserted_source) != _repo_name(event.source_repo):
+    # Empty assertions default to the event's own values, so only non-empty
+    # ones need comparing; the event side is normalized once.
+    assertions = bundle.assertions
+    event_target_repo = _normalize_repo_url(event.target_repo)
+
+    if assertions.source_repo and _repo_name(assertions.source_repo) != _repo_name(event.source_repo):
         logger.warning("Ignoring notification bundle for job %d: source repo mismatch", event.job_id)
         return None
 
-    asserted_target_repo = bundle.assertions.target_repo or event.target_repo
-    if _normalize_repo_url(asserted_target_repo) != _normalize_repo_url(event.target_repo):
+    if assertions.target_repo and _normalize_repo_url(assertions.target_repo) != event_target_repo:
         logger.warning("Ignoring notification bundle for job %d: target repo mismatch", event.job_id)
         return None
 
-    asserted_target_service = bundle.assertions.target_service or event.target_service
-    if asserted_target_service.strip() != event.target_service.strip():
+    if assertions.target_service and assertions.target_service.strip() != event.target_service.strip():
         logger.warning("Ignoring notification bundle for job %d: target service mismatch", event.job_id)
         return None
 
-    asserted_pr_url = bundle.assertions.pr_url or event.pr_url
-    if asserted_pr_url.strip() != event.pr_url.strip():
+    if assertions.pr_url and assertions.pr_url.strip() != event.pr_url.strip():
         logger.warning("Ignoring notification bundle for job %d: PR URL mismatch", event.job_id)
         return None
 
     pr_repo = _repo_from_pr_url(event.pr_url)
-    if pr_repo and _normalize_repo_url(pr_repo) != _normalize_repo_url(event.target_repo):
+    if pr_repo and _normalize_repo_url(pr_repo) != event_target_repo:
         logger.warning("Ignoring notification bundle for job %d: event PR repo does not match target repo", event.job_id)
         return None
 
@@ -115,98 +137,403 @@ def _has_devin_slack_content(bundle: NotificationBundle | None) -> bool:
     return bool(bundle and (bundle.slack.text or bundle.slack.blocks))
 
 
+def _build_slack_payload(
+    event: PROpenedEvent,
+    bundle: NotificationBundle | None,
+    jira_issue_key: str | None = None,
+    jira_issue_url: str | None = None,
+) -> tuple[list[dict], str]:
+    if _has_devin_slack_content(bundle):
+        return build_pr_notification_from_bundle(event, bundle, jira_issue_key, jira_issue_url)
+    blocks = build_pr_notification(event, jira_issue_key, jira_issue_url)
+    return blocks, build_pr_notification_text(event, jira_issue_key, jira_issue_url)
+
+
+async def _create_jira_issue(
+    jira: JiraClient,
+    event: PROpenedEvent,
+    bundle: NotificationBundle | None,
+) -> tuple[str, str]:
+    if not _has_devin_jira_content(bundle):
+        raise ValueError(_jira_bundle_error(event, bundle))
+    fields = build_issue_fields_from_notification_bundle(event, bundle)
+    result = await jira.create_issue(fields)
+    issue_key = result.get("key", "")
+    return issue_key, jira.browse_url(issue_key)
+
+
+async def _send_slack_notification(
+    slack: SlackClient,
+    event: PROpenedEvent,
+    bundle: NotificationBundle | None,
+) -> dict:
+    blocks, fallback_text = _build_slack_payload(event, bundle)
+    return await slack.send_message(blocks, text=fallback_text)
+
+
+async def _add_jira_link_to_slack(
+    slack: SlackClient,
+    slack_response: dict,
+    event: PROpenedEvent,
+    bundle: NotificationBundle | None,
+    jira_issue_key: str,
+    jira_issue_url: str,
+) -> None:
+    """Best-effort chat.update so the Slack message links the new Jira ticket."""
+    channel = slack_response.get("channel")
+    ts = slack_response.get("ts")
+    if not (channel and ts):
+        return
+    blocks, fallback_text = _build_slack_payload(event, bundle, jira_issue_key, jira_issue_url)
+    try:
+        await slack.update_message(channel, ts, blocks, text=fallback_text)
+    except Exception as exc:
+        logger.warning("Could not add Jira link to Slack message for job %d: %s", event.job_id, exc)
+
+
+class _PROpenedOutcome(NamedTuple):
+    jira_issue_key: str | None
+    jira_issue_url: str | None
+    jira_error: str | None
+    slack_error: str | None
+    errors: list[str]
+
+    @property
+    def jira_sent(self) -> bool:
+        return self.jira_error is None
+
+    @property
+    def slack_sent(self) -> bool:
+        return self.slack_error is None
+
+    def ticket_row(self, event: PROpenedEvent) -> dict:
+        return {
+            "change_id": event.change_id,
+            "job_id": event.job_id,
+            "jira_issue_key": self.jira_issue_key,
+            "jira_issue_url": self.jira_issue_url,
+        }
+
+    def fields(self) -> dict:
+        """Keyword arguments for ``save_outcome`` / ``outcome_params``."""
+        return {
+            "jira_sent": self.jira_sent,
+            "jira_error": self.jira_error,
+            "slack_sent": self.slack_sent,
+            "slack_error": self.slack_error,
+        }
+
+    def response(self) -> WebhookResponse:
+        return WebhookResponse.model_construct(
+            status=finalize_status(self.jira_sent, self.slack_sent, self.errors),
+            jira_issue_key=self.jira_issue_key,
+            jira_issue_url=self.jira_issue_url,
+            slack_sent=self.slack_sent,
+            errors=self.errors,
+        )
+
+
+async def _send_pr_opened(
+    event: PROpenedEvent,
+    jira: JiraClient,
+    slack: SlackClient,
+) -> _PROpenedOutcome:
+    """Create the Jira ticket and send the Slack message; touches no database."""
+    errors: list[str] = []
+    jira_issue_key: str | None = None
+    jira_issue_url: str | None = None
+    jira_error: str | None = None
+    slack_error: str | None = None
+    validated_bundle = _validate_notification_bundle(event, event.notification_bundle)
+
+    jira_result, slack_result = await asyncio.gather(
+        _create_jira_issue(jira, event, validated_bundle),
+        _send_slack_notification(slack, event, validated_bundle),
+        return_exceptions=True,
+    )
+
+    if isinstance(jira_result, Exception):
+        jira_error = describe_error(jira_result)
+        logger.error("Jira ticket creation failed for job %d: %s", event.job_id, jira_error)
+        errors.append(f"jira: {jira_error}")
+    else:
+        jira_issue_key, jira_issue_url = jira_result
+
+    if isinstance(slack_result, Exception):
+        slack_error = describe_error(slack_result)
+        logger.error("Slack notification failed for job %d: %s", event.job_id, slack_error)
+        errors.append(f"slack: {slack_error}")
+    elif jira_issue_key and jira_issue_url:
+        spawn_background(_add_jira_link_to_slack(
+            slack, slack_result, event, validated_bundle, jira_issue_key, jira_issue_url,
+        ))
+
+    return _PROpenedOutcome(jira_issue_key, jira_issue_url, jira_error, slack_error, errors)
+
+
+async def _claim_pr_opened(db: AsyncSession, event: PROpenedEvent, idem_key: str) -> int | None:
+    """Claim *idem_key* in a short transaction of its own; None for a duplicate."""
+    if idem_key in recent_idempotency_keys:
+        record_id = None
+    else:
+        async with db.begin():
+            record_id = await claim_idempotency(db, idem_key, event, job_id=event.job_id)
+        recent_idempotency_keys.add(idem_key)
+    if record_id is None:
+        logger.info("Duplicate webhook for job %d — skipping", event.job_id)
+    return record_id
+
+
+async def _deliver_pr_opened(
+    db: AsyncSession,
+    event: PROpenedEvent,
+    idem_key: str,
+    record_id: int,
+    jira: JiraClient,
+    slack: SlackClient,
+) -> WebhookResponse:
+    """Create the Jira ticket and send the Slack message for a claimed event.
+
+    The network calls run outside any transaction, so the database write lock
+    is never held across them; the outcome is then recorded on the claimed
+    NotificationEvent row in a second short transaction.  If sending raises,
+    the claim is released so a retry can deliver the event.  Once sent, the
+    claim stays even if recording the outcome fails, so a retry is answered
+    ``already_processed`` rather than sent twice.
+    """
+    try:
+        outcome = await _send_pr_opened(event, jira, slack)
+    except Exception:
+        await release_claims(db, [(idem_key, record_id)])
+        raise
+    async with db.begin():
+        if outcome.jira_sent:
+            await db.execute(insert(JiraTicket).values(outcome.ticket_row(event)))
+        await save_outcome(db, record_id, **outcome.fields())
+    return outcome.response()
+
+
+async def _deliver_pr_opened_in_background(
+    event: PROpenedEvent,
+    idem_key: str,
+    record_id: int,
+    jira: JiraClient,
+    slack: SlackClient,
+) -> None:
+    try:
+        async with async_session() as db:
+            await _deliver_pr_opened(db, event, idem_key, record_id, jira, slack)
+    except Exception:
+        logger.exception("Background delivery failed for job %d", event.job_id)
+
+
 async def handle_pr_opened(
     db: AsyncSession,
     event: PROpenedEvent,
+    jira: JiraClient,
+    slack: SlackClient,
 ) -> WebhookResponse:
     """Process a pr_opened webhook event.
 
-    1. Check idempotency — skip if already processed.
-    2. Create Jira ticket.
-    3. Send Slack message (includes Jira link if step 2 succeeded).
+    1. Claim the idempotency key — skip if already processed.
+    2. Create Jira ticket and send Slack message concurrently.
+    3. Update the Slack message with the Jira link in the background if both
+       succeeded — the webhook response does not wait for it.
     4. Persist results.
+
+    The claim and the results are committed in two short transactions with
+    the network calls between them (see ``_deliver_pr_opened``).  If the
+    process stops between the two, the event stays claimed but unsent, as
+    described on ``accept_pr_opened``.
     """
     idem_key = f"pr_opened:{event.job_id}"
+    record_id = await _claim_pr_opened(db, event, idem_key)
+    if record_id is None:
+        return WebhookResponse.model_construct(status="already_processed")
+    return await _deliver_pr_opened(db, event, idem_key, record_id, jira, slack)
 
-    existing = await db.execute(
-        select(NotificationEvent).where(NotificationEvent.idempotency_key == idem_key)
-    )
-    if existing.scalar_one_or_none() is not None:
-        logger.info("Duplicate webhook for job %d — skipping", event.job_id)
-        return WebhookResponse(status="already_processed")
-
-    record = NotificationEvent(
-        idempotency_key=idem_key,
-        event_type=event.event_type,
-        change_id=event.change_id,
-        job_id=event.job_id,
-        payload_json=json.dumps(event.model_dump(), default=str),
-    )
-    db.add(record)
-    await db.flush()
 
-    errors: list[str] = []
-    jira_issue_key: str | None = None
-    jira_issue_url: str | None = None
-    validated_bundle = _validate_notification_bundle(event, event.notification_bundle)
+async def accept_pr_opened(
+    db: AsyncSession,
+    event: PROpenedEvent,
+    jira: JiraClient,
+    slack: SlackClient,
+) -> WebhookResponse:
+    """Claim a pr_opened event and deliver it in the background.
 
-    try:
-        if not _has_devin_jira_content(validated_bundle):
-            raise ValueError(_jira_bundle_error(event, validated_bundle))
-        jira = JiraClient()
-        fields = build_issue_fields_from_notification_bundle(event, validated_bundle)
-        result = await jira.create_issue(fields)
-        jira_issue_key = result.get("key", "")
-        jira_issue_url = jira.browse_url(jira_issue_key)
-
-        ticket = JiraTicket(
-            change_id=event.change_id,
-            job_id=event.job_id,
-            jira_issue_key=jira_issue_key,
-            jira_issue_url=jira_issue_url,
-        )
-        db.add(ticket)
-        record.jira_sent = True
-        await jira.close()
-    except Exception as exc:
-        logger.error("Jira ticket creation failed for job %d: %s", event.job_id, exc)
-        record.jira_error = str(exc)[:500]
-        errors.append(f"jira: {exc}")
-        with suppress(Exception):
-            await jira.close()  # type: ignore[possibly-undefined]
+    Only the idempotency claim is committed before returning, so the response
+    is ``accepted`` (or ``already_processed``) and never carries Jira or Slack
+    results; those are recorded on the NotificationEvent row once delivery
+    finishes.
 
-    try:
-        slack = SlackClient()
-        if _has_devin_slack_content(validated_bundle):
-            blocks, fallback_text = build_pr_notification_from_bundle(
-                event,
-                validated_bundle,
-                jira_issue_key,
-                jira_issue_url,
-            )
-        else:
-            blocks = build_pr_notification(event, jira_issue_key, jira_issue_url)
-            fallback_text = build_pr_notification_text(event, jira_issue_key, jira_issue_url)
-        await slack.send_message(blocks, text=fallback_text)
-        record.slack_sent = True
-        await slack.close()
-    except Exception as exc:
-        logger.error("Slack notification failed for job %d: %s", event.job_id, exc)
-        record.slack_error = str(exc)[:500]
-        errors.append(f"slack: {exc}")
-        with suppress(Exception):
-            await slack.close()  # type: ignore[possibly-undefined]
-
-    await db.commit()
-
-    status = "processed"
-    if errors:
-        status = "partial" if (record.jira_sent or record.slack_sent) else "failed"
-
-    return WebhookResponse(
-        status=status,
-        jira_issue_key=jira_issue_key,
-        jira_issue_url=jira_issue_url,
-        slack_sent=record.slack_sent,
-        errors=errors,
+    Delivery is not durable: if the process stops after the claim commits but
+    before delivery finishes, the event stays claimed and is never sent, and
+    retries of it are answered ``already_processed``.  Such rows are left with
+    ``jira_sent`` and ``slack_sent`` false and no error recorded.
+    """
+    idem_key = f"pr_opened:{event.job_id}"
+    record_id = await _claim_pr_opened(db, event, idem_key)
+    if record_id is None:
+        return WebhookResponse.model_construct(status="already_processed")
+
+    spawn_background(_deliver_pr_opened_in_background(event, idem_key, record_id, jira, slack))
+    return WebhookResponse.model_construct(status="accepted", job_id=event.job_id)
+
+
+async def _handle_pr_opened_batch_sync(
+    events: list[PROpenedEvent],
+    jira: JiraClient,
+    slack: SlackClient,
+) -> list[WebhookResponse]:
+    responses: list[WebhookResponse] = [
+        WebhookResponse.model_construct(status="already_processed") for _ in events
+    ]
+    claimed: list[tuple[int, str, int, PROpenedEvent]] = []
+
+    async with async_session() as db:
+        for index, event in enumerate(events):
+            idem_key = f"pr_opened:{event.job_id}"
+            try:
+                record_id = await _claim_pr_opened(db, event, idem_key)
+            except Exception as exc:
+                # Nothing is claimed for this event, so the sender can retry it.
+                logger.error("Could not claim job %d: %s", event.job_id, exc)
+                responses[index] = WebhookResponse.model_construct(
+                    status="failed", errors=[f"claim: {describe_error(exc)}"], job_id=event.job_id,
+                )
+                continue
+            if record_id is not None:
+                claimed.append((index, idem_key, record_id, event))
+        if not claimed:
+            return responses
+
+        # No transaction is open while the network calls run.
+        sem = asyncio.Semaphore(settings.webhook_batch_concurrency)
+
+        async def _send(event: PROpenedEvent) -> _PROpenedOutcome:
+            async with sem:
+                return await _send_pr_opened(event, jira, slack)
+
+        results = await asyncio.gather(*(_send(event) for *_, event in claimed), return_exceptions=True)
+
+        # As in _deliver_pr_opened: a send that raised went nowhere, so its
+        # claim is released; the rest are recorded in one final transaction.
+        sent: list[tuple[tuple[int, str, int, PROpenedEvent], _PROpenedOutcome]] = []
+        unsent: list[tuple[str, int]] = []
+        for claim, result in zip(claimed, results):
+            index, idem_key, record_id, event = claim
+            if isinstance(result, BaseException):
+                logger.error("Delivery failed for job %d: %s", event.job_id, result)
+                responses[index] = WebhookResponse.model_construct(
+                    status="failed", errors=[describe_error(result)], job_id=event.job_id,
+                )
+                unsent.append((idem_key, record_id))
+            else:
+                sent.append((claim, result))
+        if unsent:
+            await release_claims(db, unsent)
+        if not sent:
+            return responses
+
+        ticket_rows = [outcome.ticket_row(event) for (*_, event), outcome in sent if outcome.jira_sent]
+        async with db.begin():
+            if ticket_rows:
+                await db.execute(insert(JiraTicket), ticket_rows)
+            await save_outcomes(db, [
+                outcome_params(record_id, **outcome.fields())
+                for (_, _, record_id, _), outcome in sent
+            ])
+
+    for (index, *_), outcome in sent:
+        responses[index] = outcome.response()
+    return responses
+
+
+async def handle_pr_opened_batch(
+    events: list[PROpenedEvent],
+    jira: JiraClient,
+    slack: SlackClient,
+    *,
+    accept: bool = False,
+) -> list[WebhookResponse]:
+    """Process several pr_opened events from one request.
+
+    Each event is claimed in its own short transaction; an event whose claim
+    fails is answered ``failed`` and the others go ahead.  Then up to
+    ``settings.webhook_batch_concurrency`` Jira/Slack deliveries run at once
+    outside any transaction, and finally the Jira tickets and outcomes are
+    written in one transaction with one statement each.  As in
+    ``handle_pr_opened``, a delivery that raises releases its claim, and once
+    sent a claim stays even if the final write fails, so retries are not sent
+    twice.
+
+    Delivery is not durable: claims are committed before any event is sent, so
+    if the process stops during the fan-out, every claimed event stays
+    claimed but unsent and its retries are answered ``already_processed``, as
+    described on ``accept_pr_opened``.  With *accept*, events are instead
+    claimed and delivered in the background one by one, as by
+    ``accept_pr_opened``.  Responses are in the same order as *events*.
+    """
+    if not accept:
+        return await _handle_pr_opened_batch_sync(events, jira, slack)
+
+    async def _accept(event: PROpenedEvent) -> WebhookResponse:
+        async with async_session() as db:
+            return await accept_pr_opened(db, event, jira, slack)
+
+    return [await _accept(event) for event in events]
+
+
+def _invalid_event_response(exc: ValidationError) -> WebhookResponse:
+    first = exc.errors(include_url=False)[0]
+    location = ".".join(str(part) for part in first["loc"]) or "event"
+    return WebhookResponse.model_construct(
+        status="failed",
+        errors=[f"invalid event: {location}: {first['msg']}"],
     )
+
+
+async def handle_pr_opened_stream(
+    events: AsyncIterator[PROpenedEvent | ValidationError],
+    jira: JiraClient,
+    slack: SlackClient,
+    *,
+    accept: bool = False,
+) -> list[WebhookResponse]:
+    """Process pr_opened events as they are read from a streamed request body.
+
+    Each event is handled as if posted alone, in its own session, with at most
+    ``settings.webhook_batch_concurrency`` in flight; the stream is not read
+    further while that many are pending.  Items that failed validation, and
+    events whose handling raised, are answered ``failed`` in place, so the
+    sender can still see which events went through.  Responses are in stream
+    order.  If reading the stream fails, events already started are finished
+    before the error propagates.
+    """
+    process = accept_pr_opened if accept else handle_pr_opened
+    sem = asyncio.Semaphore(settings.webhook_batch_concurrency)
+
+    async def _process(event: PROpenedEvent) -> WebhookResponse:
+        try:
+            async with async_session() as db:
+                return await process(db, event, jira, slack)
+        except Exception:
+            logger.exception("Streamed delivery failed for job %d", event.job_id)
+            return WebhookResponse.model_construct(status="failed", errors=["internal error"], job_id=event.job_id)
+        finally:
+            sem.release()
+
+    results: list[WebhookResponse | asyncio.Task[WebhookResponse]] = []
+    try:
+        async for item in events:
+            if isinstance(item, ValidationError):
+                results.append(_invalid_event_response(item))
+                continue
+            await sem.acquire()
+            results.append(asyncio.create_task(_process(item)))
+    finally:
+        # Claimed events are seen through rather than cancelled mid-delivery,
+        # so their outcomes are recorded and a retry is deduplicated.
+        tasks = [result for result in results if isinstance(result, asyncio.Task)]
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return [result.result() if isinstance(result, asyncio.Task) else result for result in results]
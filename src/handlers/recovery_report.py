@@ -3,36 +3,57 @@
 When all remediation PRs for a contract change are merged, api-core fires a
 recovery_complete webhook.  This handler:
 
-1. Checks idempotency — skip if already processed.
+1. Claims idempotency — skip if already processed — and looks up the Jira
+   tickets for the change, in one short transaction.
 2. Optionally fetches a billing summary from billing-service.
-3. Sends a rich Slack post-incident report.
-4. Adds a resolution comment to every open Jira ticket for the change.
-5. Persists results.
+3. Sends a rich Slack post-incident report and adds a resolution comment to
+   every open Jira ticket for the change, concurrently and outside any
+   transaction.
+4. Persists results in a second short transaction.
 
 Graceful degradation: billing, Slack, or Jira failures do not block each other.
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
-from contextlib import suppress
+from collections.abc import Awaitable
 
-import httpx
-from sqlalchemy import select
+import orjson
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.clients.circuit_breaker import get_breaker
+from src.clients.http_pool import get_http_client
 from src.clients.jira_client import JiraClient
 from src.clients.slack_client import SlackClient
 from src.config import settings
+from src.handlers._common import (
+    claim_idempotency,
+    describe_error,
+    finalize_status,
+    recent_idempotency_keys,
+    release_claims,
+    save_outcome,
+)
 from src.models.jira_ticket import JiraTicket
-from src.models.notification_event import NotificationEvent
 from src.schemas.events import RecoveryCompleteEvent, WebhookResponse
 from src.templates.jira_templates import build_recovery_comment
 from src.templates.slack_templates import build_recovery_report, build_recovery_report_text
 
 logger = logging.getLogger(__name__)
 
+_TICKET_KEYS_FOR_CHANGE = select(JiraTicket.jira_issue_key).where(
+    JiraTicket.change_id == bindparam("change_id")
+)
+
+
+async def _get_billing_summary(url: str) -> dict:
+    resp = await get_http_client("billing").get(url)
+    resp.raise_for_status()
+    return orjson.loads(resp.content)
+
 
 async def _fetch_billing_summary() -> dict | None:
     """Best-effort fetch of the billing summary from billing-service."""
@@ -40,97 +61,133 @@ async def _fetch_billing_summary() -> dict | None:
         return None
     url = f"{settings.billing_url.rstrip('/')}/api/v1/billing/summary"
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            return resp.json()
+        return await get_breaker("billing").call(_get_billing_summary, url)
     except Exception as exc:
         logger.warning("Could not fetch billing summary: %s", exc)
         return None
 
 
+async def _send_recovery_report(
+    slack: SlackClient,
+    event: RecoveryCompleteEvent,
+    billing: Awaitable[dict | None],
+) -> None:
+    billing_summary = await billing
+    blocks = build_recovery_report(event, billing_summary)
+    fallback_text = build_recovery_report_text(event, billing_summary)
+    await slack.send_message(blocks, text=fallback_text)
+
+
+async def _comment_on_tickets(
+    jira: JiraClient,
+    issue_keys: list[str],
+    event: RecoveryCompleteEvent,
+    billing: Awaitable[dict | None],
+) -> tuple[str | None, int, list[str]]:
+    """Comment on every Jira ticket for the change.
+
+    Returns the last commented issue key, the success count, and one error per
+    failed comment.  Raises if Jira is unusable.
+    """
+    if not issue_keys:
+        logger.info("No Jira tickets found for change %d", event.change_id)
+        return None, 0, []
+
+    comment_body = build_recovery_comment(event, await billing)
+    outcomes = await jira.add_comments(issue_keys, comment_body)
+
+    jira_issue_key: str | None = None
+    jira_successes = 0
+    failures: list[str] = []
+    for issue_key, exc in outcomes.items():
+        if exc is None:
+            jira_issue_key = issue_key
+            jira_successes += 1
+            continue
+        comment_error = describe_error(exc)
+        logger.error("Failed to comment on %s: %s", issue_key, comment_error)
+        failures.append(f"jira_comment:{issue_key}: {comment_error}")
+    return jira_issue_key, jira_successes, failures
+
+
 async def handle_recovery_complete(
     db: AsyncSession,
     event: RecoveryCompleteEvent,
+    jira: JiraClient,
+    slack: SlackClient,
 ) -> WebhookResponse:
     """Process a recovery_complete webhook event."""
     idem_key = f"recovery_complete:{event.change_id}"
-
-    existing = await db.execute(
-        select(NotificationEvent).where(NotificationEvent.idempotency_key == idem_key)
-    )
-    if existing.scalar_one_or_none() is not None:
+    if idem_key in recent_idempotency_keys:
         logger.info("Duplicate recovery webhook for change %d — skipping", event.change_id)
-        return WebhookResponse(status="already_processed")
-
-    record = NotificationEvent(
-        idempotency_key=idem_key,
-        event_type=event.event_type,
-        change_id=event.change_id,
-        job_id=0,
-        payload_json=json.dumps(event.model_dump(), default=str),
-    )
-    db.add(record)
-    await db.flush()
+        return WebhookResponse.model_construct(status="already_processed")
+
+    # The claim and the ticket lookup commit in a short transaction of their
+    # own, so the database write lock is never held across billing, Slack or
+    # Jira.
+    async with db.begin():
+        record_id = await claim_idempotency(db, idem_key, event, job_id=0)
+        issue_keys: list[str] = []
+        if record_id is not None:
+            issue_keys = list((
+                await db.scalars(_TICKET_KEYS_FOR_CHANGE, {"change_id": event.change_id})
+            ).all())
+    recent_idempotency_keys.add(idem_key)
+    if record_id is None:
+        logger.info("Duplicate recovery webhook for change %d — skipping", event.change_id)
+        return WebhookResponse.model_construct(status="already_processed")
 
     errors: list[str] = []
-    billing_summary = await _fetch_billing_summary()
-
-    try:
-        slack = SlackClient()
-        blocks = build_recovery_report(event, billing_summary)
-        fallback_text = build_recovery_report_text(event, billing_summary)
-        await slack.send_message(blocks, text=fallback_text)
-        record.slack_sent = True
-        await slack.close()
-    except Exception as exc:
-        logger.error("Slack recovery report failed for change %d: %s", event.change_id, exc)
-        record.slack_error = str(exc)[:500]
-        errors.append(f"slack: {exc}")
-        with suppress(Exception):
-            await slack.close()  # type: ignore[possibly-undefined]
-
     jira_issue_key: str | None = None
+    jira_sent = slack_sent = False
+    jira_error: str | None = None
+    slack_error: str | None = None
+
+    # Billing is shared by both branches; the Slack report and Jira comments go
+    # out concurrently, outside any transaction.  If this raises, nothing was
+    # recorded as sent: the claim is released so a retry can deliver the report.
+    billing = asyncio.ensure_future(_fetch_billing_summary())
     try:
-        ticket_result = await db.execute(
-            select(JiraTicket).where(JiraTicket.change_id == event.change_id)
+        slack_result, jira_result = await asyncio.gather(
+            _send_recovery_report(slack, event, billing),
+            _comment_on_tickets(jira, issue_keys, event, billing),
+            return_exceptions=True,
+        )
+    except Exception:
+        await release_claims(db, [(idem_key, record_id)])
+        raise
+
+    if isinstance(slack_result, Exception):
+        slack_error = describe_error(slack_result)
+        logger.error("Slack recovery report failed for change %d: %s", event.change_id, slack_error)
+        errors.append(f"slack: {slack_error}")
+    else:
+        slack_sent = True
+
+    if isinstance(jira_result, Exception):
+        jira_error = describe_error(jira_result)
+        logger.error("Jira commenting failed for change %d: %s", event.change_id, jira_error)
+        errors.append(f"jira: {jira_error}")
+    else:
+        jira_issue_key, jira_successes, comment_errors = jira_result
+        jira_sent = jira_successes > 0
+        errors.extend(comment_errors)
+
+    # Once sent, the claim stays even if recording the outcome fails, so a
+    # retry is answered already_processed rather than sent twice.
+    async with db.begin():
+        await save_outcome(
+            db,
+            record_id,
+            jira_sent=jira_sent,
+            jira_error=jira_error,
+            slack_sent=slack_sent,
+            slack_error=slack_error,
         )
-        tickets = ticket_result.scalars().all()
-
-        if tickets:
-            jira = JiraClient()
-            comment_body = build_recovery_comment(event, billing_summary)
-            jira_successes = 0
-            for ticket in tickets:
-                try:
-                    await jira.add_comment(ticket.jira_issue_key, comment_body)
-                    jira_issue_key = ticket.jira_issue_key
-                    jira_successes += 1
-                except Exception as exc:
-                    logger.error(
-                        "Failed to comment on %s: %s", ticket.jira_issue_key, exc
-                    )
-                    errors.append(f"jira_comment:{ticket.jira_issue_key}: {exc}")
-            record.jira_sent = jira_successes > 0
-            await jira.close()
-        else:
-            logger.info("No Jira tickets found for change %d", event.change_id)
-    except Exception as exc:
-        logger.error("Jira commenting failed for change %d: %s", event.change_id, exc)
-        record.jira_error = str(exc)[:500]
-        errors.append(f"jira: {exc}")
-        with suppress(Exception):
-            await jira.close()  # type: ignore[possibly-undefined]
-
-    await db.commit()
-
-    status = "processed"
-    if errors:
-        status = "partial" if (record.jira_sent or record.slack_sent) else "failed"
 
-    return WebhookResponse(
-        status=status,
+    return WebhookResponse.model_construct(
+        status=finalize_status(jira_sent, slack_sent, errors),
         jira_issue_key=jira_issue_key,
-        slack_sent=record.slack_sent,
+        slack_sent=slack_sent,
         errors=errors,
     )
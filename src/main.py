@@ -1,25 +1,55 @@
 """FastAPI application for notification-service."""
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.background import drain_background_tasks
+from src.clients.circuit_breaker import breaker_states
+from src.clients.http_pool import close_http_clients
+from src.clients.jira_client import JiraClient, get_jira_client
+from src.clients.slack_client import SlackClient, get_slack_client
 from src.config import settings
 from src.database import init_db, close_db
+from src.routes._common import install_body_schemas
 from src.routes.webhooks import router as webhooks_router
 
 logging.basicConfig(level=logging.DEBUG if settings.debug else logging.INFO)
 logger = logging.getLogger(__name__)
 
+_WARM_UP_TIMEOUT = 2.0
+
+
+async def _warm_up_client(client: JiraClient | SlackClient) -> None:
+    try:
+        await asyncio.wait_for(client.warm_up(), timeout=_WARM_UP_TIMEOUT)
+    except Exception as exc:
+        logger.info("Skipping %s warm-up: %s", type(client).__name__, exc)
+
+
+async def _warm_up_clients() -> None:
+    """Pre-open Jira and Slack connections so the first webhook skips DNS and TLS setup."""
+    await asyncio.gather(
+        _warm_up_client(get_jira_client()),
+        _warm_up_client(get_slack_client()),
+    )
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("notification-service starting up")
     await init_db()
+    await _warm_up_clients()
     yield
     logger.info("notification-service shutting down")
+    await drain_background_tasks()
+    await close_http_clients()
+    # The shared clients hold the pooled httpx clients just closed.
+    get_jira_client.cache_clear()
+    get_slack_client.cache_clear()
     await close_db()
 
 
@@ -39,8 +69,16 @@ app.add_middleware(
 )
 
 app.include_router(webhooks_router, prefix=settings.api_prefix)
+install_body_schemas(app)
 
 
 @app.get("/health")
-async def health():
-    return {"status": "ok", "service": "notification-service"}
+async def health() -> dict[str, str | dict[str, str]]:
+    """Liveness plus per-downstream circuit state; "degraded" while any is open.
+
+    A half-open breaker is not degraded: it admits a trial call, and an idle
+    instance would otherwise stay half-open, and drained, indefinitely.
+    """
+    circuits = breaker_states()
+    status = "degraded" if any(state == "open" for state in circuits.values()) else "ok"
+    return {"status": status, "service": "notification-service", "circuits": circuits}
@@ -2,13 +2,16 @@
 
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 
 from src.database import Base
 
 
 class JiraTicket(Base):
     __tablename__ = "jira_tickets"
+    # Recovery reports look tickets up by change_id; the key rides along so the
+    # lookup stays on the index.
+    __table_args__ = (Index("ix_jira_tickets_change_id_key", "change_id", "jira_issue_key"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     change_id = Column(Integer, nullable=False)
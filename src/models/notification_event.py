@@ -16,6 +16,7 @@ class NotificationEvent(Base):
     change_id = Column(Integer, nullable=False)
     job_id = Column(Integer, nullable=False)
     payload_json = Column(Text, nullable=False)
+    payload_sha256 = Column(String(64), nullable=True)
     jira_sent = Column(Boolean, default=False, nullable=False)
     jira_error = Column(Text, nullable=True)
     slack_sent = Column(Boolean, default=False, nullable=False)
@@ -0,0 +1,169 @@
+"""Helpers shared by the webhook routes."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any, TypeVar
+
+from fastapi import FastAPI, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.openapi.utils import validation_error_definition, validation_error_response_definition
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import PydanticCustomError
+
+T = TypeVar("T")
+
+# FastAPI only documents a 422 for parameters and body fields it parses itself,
+# so routes reading their body through json_body/ndjson_body declare it here.
+# The schema is FastAPI's own, inlined so it does not depend on components.
+VALIDATION_ERROR_RESPONSES: dict[int | str, dict[str, Any]] = {
+    422: {
+        "description": "Validation Error",
+        "content": {
+            "application/json": {
+                "schema": {
+                    **validation_error_response_definition,
+                    "properties": {
+                        "detail": {"title": "Detail", "type": "array", "items": validation_error_definition},
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+def json_body(model: type[T]) -> Callable[[Request], Awaitable[T]]:
+    """Dependency that parses the raw request body straight into *model*.
+
+    *model* is a pydantic model or any type ``TypeAdapter`` accepts, such as
+    a discriminated union of models.
+
+    pydantic-core parses and validates in one pass instead of FastAPI's
+    ``json.loads`` followed by ``model_validate``.  The ``TypeAdapter`` is
+    built once, when the route module is imported.  Failures surface as the
+    usual 422 response, with locations prefixed by ``"body"``.
+    """
+    adapter = TypeAdapter(model)
+
+    async def _parse(request: Request) -> T:
+        try:
+            return adapter.validate_json(await request.body())
+        except ValidationError as exc:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in exc.errors(include_url=False)]
+            ) from None
+
+    return _parse
+
+
+def ndjson_body(
+    model: type[T],
+    *,
+    max_line_bytes: int,
+) -> Callable[[Request], Awaitable[AsyncIterator[T | ValidationError]]]:
+    """Dependency that streams a newline-delimited JSON body as *model* items.
+
+    Lines are validated one at a time as the body arrives, so the whole
+    request is never held in memory.  Blank lines are skipped; a line that
+    fails validation is yielded as its ``ValidationError`` so the caller can
+    report it without discarding the events already handled.  A line longer
+    than *max_line_bytes* is reported the same way, and its remaining bytes
+    are discarded unread rather than buffered.
+    """
+    adapter = TypeAdapter(model)
+    too_long = ValidationError.from_exception_data(
+        getattr(model, "__name__", "line"),
+        [{
+            "type": PydanticCustomError("line_too_long", "line exceeds {max_bytes} bytes", {"max_bytes": max_line_bytes}),
+            "loc": (),
+            "input": None,
+        }],
+    )
+
+    def _validate(line: bytes) -> T | ValidationError:
+        if len(line) > max_line_bytes:
+            return too_long
+        try:
+            return adapter.validate_json(line)
+        except ValidationError as exc:
+            return exc
+
+    async def _items(request: Request) -> AsyncIterator[T | ValidationError]:
+        pending = b""
+        discarding = False
+        async for chunk in request.stream():
+            if discarding:
+                newline = chunk.find(b"\n")
+                if newline < 0:
+                    continue
+                chunk = chunk[newline + 1:]
+                discarding = False
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield _validate(line)
+            if len(pending) > max_line_bytes:
+                yield too_long
+                pending = b""
+                discarding = True
+        if pending.strip():
+            yield _validate(pending)
+
+    # Returned rather than yielded: FastAPI would treat an async generator
+    # dependency as a setup/teardown dependency.
+    async def _stream(request: Request) -> AsyncIterator[T | ValidationError]:
+        return _items(request)
+
+    return _stream
+
+
+# Models referenced from request-body schemas, registered under
+# components/schemas by install_body_schemas() so every $ref — including
+# discriminator mappings — resolves.
+_body_schemas: dict[str, Any] = {}
+
+
+def _body_schema(model: Any) -> dict[str, Any]:
+    schema = TypeAdapter(model).json_schema(ref_template="#/components/schemas/{model}")
+    _body_schemas.update(schema.pop("$defs", {}))
+    return schema
+
+
+def json_body_openapi(model: Any) -> dict[str, Any]:
+    """``openapi_extra`` documenting *model* as the JSON request body."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": _body_schema(model)}},
+        }
+    }
+
+
+def ndjson_body_openapi(model: Any) -> dict[str, Any]:
+    """``openapi_extra`` documenting an NDJSON body of *model* items, one per line."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": _body_schema(model)}},
+        }
+    }
+
+
+def install_body_schemas(app: FastAPI) -> None:
+    """Add the body models' schemas to *app*'s generated OpenAPI components.
+
+    FastAPI only registers models it parses itself, not those documented
+    through ``openapi_extra``.  Schemas FastAPI already registered win.
+    """
+    generate = app.openapi
+
+    def _openapi() -> dict[str, Any]:
+        if app.openapi_schema is None:
+            schema = generate()
+            components = schema.setdefault("components", {}).setdefault("schemas", {})
+            for name, body_schema in _body_schemas.items():
+                components.setdefault(name, body_schema)
+        return app.openapi_schema
+
+    app.openapi = _openapi
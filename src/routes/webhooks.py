@@ -1,33 +1,125 @@
 """Webhook routes for notification-service."""
 
-from fastapi import APIRouter, Depends
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, Response, status
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.clients.jira_client import JiraClient, get_jira_client
+from src.clients.slack_client import SlackClient, get_slack_client
+from src.config import settings
 from src.database import get_db
-from src.handlers.event_handler import handle_pr_opened
+from src.handlers.event_handler import (
+    accept_pr_opened,
+    handle_pr_opened,
+    handle_pr_opened_batch,
+    handle_pr_opened_stream,
+)
 from src.handlers.recovery_report import handle_recovery_complete
-from src.schemas.events import PROpenedEvent, RecoveryCompleteEvent, WebhookResponse
+from src.routes._common import (
+    VALIDATION_ERROR_RESPONSES,
+    json_body,
+    json_body_openapi,
+    ndjson_body,
+    ndjson_body_openapi,
+)
+from src.schemas.events import PROpenedEvent, RecoveryCompleteEvent, WebhookEvent, WebhookResponse
 
 router = APIRouter(tags=["webhooks"])
 
 
-@router.post("/webhooks/pr-opened", response_model=WebhookResponse)
+@router.post(
+    "/webhooks/pr-opened",
+    response_model=WebhookResponse,
+    responses={
+        status.HTTP_202_ACCEPTED: {"model": WebhookResponse, "description": "Accepted for delivery"},
+        **VALIDATION_ERROR_RESPONSES,
+    },
+    openapi_extra=json_body_openapi(PROpenedEvent),
+)
 async def pr_opened_webhook(
-    event: PROpenedEvent,
+    response: Response,
+    event: PROpenedEvent = Depends(json_body(PROpenedEvent)),
     db: AsyncSession = Depends(get_db),
+    jira: JiraClient = Depends(get_jira_client),
+    slack: SlackClient = Depends(get_slack_client),
+    sync: bool | None = None,
 ) -> WebhookResponse:
     """Receive a PR-opened event from api-core.
 
     Creates a Jira ticket and sends a Slack notification.
     Idempotent — duplicate events for the same job_id are skipped.
+    With ``?sync=false`` (the default when ``NOTIF_ASYNC_PR_OPENED`` is set),
+    returns 202 ``accepted`` once the event is claimed and delivers in the
+    background; ``?sync=true`` always waits for the delivery outcome.
+    An accepted event is lost if the service stops before its background
+    delivery finishes — retries are deduplicated — so synchronous delivery
+    stays the default.
+    """
+    if sync is None:
+        sync = not settings.async_pr_opened
+    if sync:
+        return await handle_pr_opened(db, event, jira, slack)
+    result = await accept_pr_opened(db, event, jira, slack)
+    if result.status == "accepted":
+        response.status_code = status.HTTP_202_ACCEPTED
+    return result
+
+
+@router.post(
+    "/webhooks/pr-opened/batch",
+    response_model=list[WebhookResponse],
+    responses=VALIDATION_ERROR_RESPONSES,
+    openapi_extra=json_body_openapi(list[PROpenedEvent]),
+)
+async def pr_opened_batch_webhook(
+    events: list[PROpenedEvent] = Depends(json_body(list[PROpenedEvent])),
+    jira: JiraClient = Depends(get_jira_client),
+    slack: SlackClient = Depends(get_slack_client),
+) -> list[WebhookResponse]:
+    """Receive a JSON array of PR-opened events in one request.
+
+    Each event is handled as by ``/webhooks/pr-opened``; the response lists
+    one outcome per event, in request order.
     """
-    return await handle_pr_opened(db, event)
+    return await handle_pr_opened_batch(events, jira, slack, accept=settings.async_pr_opened)
+
 
+@router.post(
+    "/webhooks/pr-opened/ndjson",
+    response_model=list[WebhookResponse],
+    responses=VALIDATION_ERROR_RESPONSES,
+    openapi_extra=ndjson_body_openapi(PROpenedEvent),
+)
+async def pr_opened_ndjson_webhook(
+    events: AsyncIterator[PROpenedEvent | ValidationError] = Depends(
+        ndjson_body(PROpenedEvent, max_line_bytes=settings.ndjson_max_line_bytes)
+    ),
+    jira: JiraClient = Depends(get_jira_client),
+    slack: SlackClient = Depends(get_slack_client),
+) -> list[WebhookResponse]:
+    """Receive PR-opened events as newline-delimited JSON, one event per line.
+
+    Events are handled as they arrive instead of after the whole body is read.
+    The response lists one outcome per non-blank line, in order; a line that
+    is not a valid event, or is longer than ``NOTIF_NDJSON_MAX_LINE_BYTES``,
+    is reported as ``failed`` without affecting the rest.
+    """
+    return await handle_pr_opened_stream(events, jira, slack, accept=settings.async_pr_opened)
 
-@router.post("/webhooks/recovery-complete", response_model=WebhookResponse)
+
+@router.post(
+    "/webhooks/recovery-complete",
+    response_model=WebhookResponse,
+    responses=VALIDATION_ERROR_RESPONSES,
+    openapi_extra=json_body_openapi(RecoveryCompleteEvent),
+)
 async def recovery_complete_webhook(
-    event: RecoveryCompleteEvent,
+    event: RecoveryCompleteEvent = Depends(json_body(RecoveryCompleteEvent)),
     db: AsyncSession = Depends(get_db),
+    jira: JiraClient = Depends(get_jira_client),
+    slack: SlackClient = Depends(get_slack_client),
 ) -> WebhookResponse:
     """Receive a recovery_complete event from api-core.
 
@@ -35,4 +127,27 @@ async def recovery_complete_webhook(
     and adds a resolution comment to every open Jira ticket for the change.
     Idempotent — duplicate events for the same change_id are skipped.
     """
-    return await handle_recovery_complete(db, event)
+    return await handle_recovery_complete(db, event, jira, slack)
+
+
+@router.post(
+    "/webhooks",
+    response_model=WebhookResponse,
+    responses=VALIDATION_ERROR_RESPONSES,
+    openapi_extra=json_body_openapi(WebhookEvent),
+)
+async def webhook(
+    response: Response,
+    event: WebhookEvent = Depends(json_body(WebhookEvent)),
+    db: AsyncSession = Depends(get_db),
+    jira: JiraClient = Depends(get_jira_client),
+    slack: SlackClient = Depends(get_slack_client),
+    sync: bool | None = None,
+) -> WebhookResponse:
+    """Receive any api-core event, dispatched on its ``event_type``.
+
+    Behaves exactly like the matching per-event route above.
+    """
+    if isinstance(event, RecoveryCompleteEvent):
+        return await recovery_complete_webhook(event, db, jira, slack)
+    return await pr_opened_webhook(response, event, db, jira, slack, sync)
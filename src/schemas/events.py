@@ -1,7 +1,6 @@
 """Pydantic models for webhook payloads."""
 
-from datetime import datetime
-from typing import Optional
+from typing import Annotated, Literal, Optional, Union
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -55,10 +54,10 @@ class NotificationBundle(BaseModel):
 class PROpenedEvent(BaseModel):
     model_config = ConfigDict(extra="ignore")
 
-    event_type: str = "pr_opened"
+    event_type: Literal["pr_opened"] = "pr_opened"
     change_id: int
     job_id: int
-    timestamp: datetime
+    timestamp: str
     source_repo: str = "api-core"
     target_repo: str
     target_service: str
@@ -73,7 +72,7 @@ class PROpenedEvent(BaseModel):
 
 
 class JobSummary(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", frozen=True)
 
     job_id: int
     target_repo: str = ""
@@ -87,7 +86,7 @@ class JobSummary(BaseModel):
 class RecoveryCompleteEvent(BaseModel):
     model_config = ConfigDict(extra="ignore")
 
-    event_type: str = "recovery_complete"
+    event_type: Literal["recovery_complete"] = "recovery_complete"
     change_id: int
     timestamp: str
     source_repo: str = "api-core"
@@ -101,9 +100,29 @@ class RecoveryCompleteEvent(BaseModel):
     mttr_seconds: int = 0
 
 
+# Any api-core event, told apart by ``event_type`` alone so pydantic-core only
+# validates the matching variant.
+WebhookEvent = Annotated[
+    Union[PROpenedEvent, RecoveryCompleteEvent],
+    Field(discriminator="event_type"),
+]
+
+
 class WebhookResponse(BaseModel):
+    """Webhook outcome.
+
+    Handlers assemble it from values they produced themselves, so they use
+    ``model_construct`` and skip validation; anything built from untrusted
+    input must go through the normal constructor.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
     status: str
     jira_issue_key: Optional[str] = None
     jira_issue_url: Optional[str] = None
     slack_sent: Optional[bool] = None
     errors: list[str] = Field(default_factory=list)
+    # Set on "accepted" responses so the caller can match the event to the
+    # outcome recorded once background delivery finishes.
+    job_id: Optional[int] = None
@@ -0,0 +1,41 @@
+"""Helpers shared by the Jira and Slack template builders."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import NamedTuple
+
+from src.schemas.events import RecoveryCompleteEvent
+
+
+def repo_name(repo_url: str) -> str:
+    return repo_url.rstrip("/").split("/")[-1] if repo_url else "unknown"
+
+
+@lru_cache(maxsize=32)
+def severity_label(is_breaking: bool, severity: str) -> str:
+    """``"BREAKING"`` for breaking changes, else the upper-cased severity."""
+    return "BREAKING" if is_breaking else severity.upper()
+
+
+@lru_cache(maxsize=4096)
+def format_mttr(seconds: int) -> str:
+    """Render an MTTR as ``"45m"`` or ``"2h 5m"`` (minute resolution)."""
+    minutes = seconds // 60
+    return f"{minutes}m" if minutes < 60 else f"{minutes // 60}h {minutes % 60}m"
+
+
+class JobRow(NamedTuple):
+    service: str
+    target_repo: str
+    target_repo_name: str
+    pr_url: str
+
+
+def job_rows(event: RecoveryCompleteEvent) -> list[JobRow]:
+    """Flatten ``event.jobs`` once so builders don't re-read model attributes per line."""
+    rows = []
+    for job in event.jobs:
+        target_repo_name = repo_name(job.target_repo)
+        rows.append(JobRow(job.target_service or target_repo_name, job.target_repo, target_repo_name, job.pr_url))
+    return rows
@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 
 from src.config import settings
 from src.schemas.events import NotificationBundle, PROpenedEvent, RecoveryCompleteEvent
+from src.templates._common import format_mttr, job_rows, repo_name, severity_label
 
 
 def _text_node(text: str) -> dict:
@@ -16,6 +18,12 @@ def _bold_text(text: str) -> dict:
     return {"type": "text", "text": text, "marks": [{"type": "strong"}]}
 
 
+@lru_cache(maxsize=None)
+def _label(text: str) -> dict:
+    """Shared bold label node; only a handful of distinct labels exist."""
+    return _bold_text(text)
+
+
 def _link_node(text: str, href: str) -> dict:
     return {
         "type": "text",
@@ -36,10 +44,6 @@ def _heading(text: str, level: int = 3) -> dict:
     }
 
 
-def _repo_name(repo_url: str) -> str:
-    return repo_url.rstrip("/").split("/")[-1] if repo_url else "unknown"
-
-
 def _label_slug(value: str) -> str:
     return re.sub(r"[^a-z0-9_-]+", "-", value.lower()).strip("-")[:255] or "unknown"
 
@@ -48,21 +52,36 @@ def _bullet_list(*items: str) -> dict:
     return {
         "type": "bulletList",
         "content": [
-            {"type": "listItem", "content": [_paragraph(_text_node(item))]}
+            # Inlined rather than built via _paragraph/_text_node: this runs
+            # once per job on large recovery reports.
+            {"type": "listItem", "content": [{"type": "paragraph", "content": [{"type": "text", "text": item}]}]}
             for item in items
         ],
     }
 
 
-def _generated_by_paragraph() -> dict:
-    return _paragraph(
-        _bold_text("Generated by: "),
-        _text_node("Devin via notification-service"),
-    )
+# Static ADF nodes are built once and shared between documents; they are only
+# ever serialized, never mutated.
+_GENERATED_BY = _paragraph(
+    _bold_text("Generated by: "),
+    _text_node("Devin via notification-service"),
+)
+_CANONICAL_CONTEXT_HEADING = _heading("Canonical Context")
+_RECOVERY_HEADING = _heading("Post-Incident Recovery Report", level=2)
+_RECOVERY_STATUS = _paragraph(_bold_text("Status: "), _text_node("RESOLVED — all services remediated"))
+_SERVICES_REMEDIATED_HEADING = _heading("Services Remediated", level=3)
+_NO_JOBS_RECORDED = _paragraph(_text_node("No jobs recorded"))
+_COST_CONTEXT_HEADING = _heading("Platform Cost Context", level=3)
+
+
+@lru_cache(maxsize=8)
+def _severity_paragraph(is_breaking: bool, severity: str) -> dict:
+    """Shared per-severity node; a handful of distinct severities exist in practice."""
+    return _paragraph(_label("Severity: "), _text_node(f"{severity_label(is_breaking, severity)} ({severity})"))
 
 
 def _default_issue_summary(event: PROpenedEvent) -> str:
-    return f"[ACCR] {event.target_service}: review downstream PR for {_repo_name(event.source_repo)} change"
+    return f"[ACCR] {event.target_service}: review downstream PR for {repo_name(event.source_repo)} change"
 
 
 def _base_labels(event: PROpenedEvent) -> list[str]:
@@ -70,7 +89,7 @@ def _base_labels(event: PROpenedEvent) -> list[str]:
         "contract-change",
         "devin-remediation",
         f"service-{_label_slug(event.target_service)}",
-        f"repo-{_label_slug(_repo_name(event.target_repo))}",
+        f"repo-{_label_slug(repo_name(event.target_repo))}",
     ]
 
 
@@ -101,19 +120,28 @@ def _resolve_project_key(event: PROpenedEvent) -> str:
         for key, value in settings.jira_project_keys_by_repo.items()
         if str(key).strip() and str(value).strip()
     }
-    repo_name = _repo_name(event.target_repo).strip().lower()
+    target_repo_name = repo_name(event.target_repo).strip().lower()
     service_name = event.target_service.strip().lower()
-    return repo_mappings.get(repo_name) or repo_mappings.get(service_name) or settings.jira_project_key
+    return repo_mappings.get(target_repo_name) or repo_mappings.get(service_name) or settings.jira_project_key
+
+
+# Each row pairs a prebuilt label node with a factory for the per-event value.
+_CANONICAL_CONTEXT_ROWS = (
+    (_bold_text("Source repo: "), lambda event: _text_node(repo_name(event.source_repo))),
+    (_bold_text("Downstream service: "), lambda event: _text_node(event.target_service)),
+    (_bold_text("Downstream repo: "), lambda event: _text_node(event.target_repo)),
+    (_bold_text("Downstream PR: "), lambda event: _link_node(event.pr_url, event.pr_url)),
+    (
+        _bold_text("Devin session: "),
+        lambda event: _link_node(event.devin_session_url, event.devin_session_url),
+    ),
+)
 
 
 def _canonical_context(event: PROpenedEvent) -> list[dict]:
     return [
-        _heading("Canonical Context"),
-        _paragraph(_bold_text("Source repo: "), _text_node(_repo_name(event.source_repo))),
-        _paragraph(_bold_text("Downstream service: "), _text_node(event.target_service)),
-        _paragraph(_bold_text("Downstream repo: "), _text_node(event.target_repo)),
-        _paragraph(_bold_text("Downstream PR: "), _link_node(event.pr_url, event.pr_url)),
-        _paragraph(_bold_text("Devin session: "), _link_node(event.devin_session_url, event.devin_session_url)),
+        _CANONICAL_CONTEXT_HEADING,
+        *(_paragraph(label, value(event)) for label, value in _CANONICAL_CONTEXT_ROWS),
     ]
 
 
@@ -143,7 +171,7 @@ def build_issue_fields_from_notification_bundle(
         "version": 1,
         "type": "doc",
         "content": [
-            _generated_by_paragraph(),
+            _GENERATED_BY,
             *body_doc.get("content", []),
             *_canonical_context(event),
         ],
@@ -158,33 +186,30 @@ def build_recovery_comment(
     billing_summary: dict | None = None,
 ) -> dict:
     """Build an ADF comment body for the post-incident recovery report."""
-    mttr_min = event.mttr_seconds // 60
-    mttr_str = f"{mttr_min}m" if mttr_min < 60 else f"{mttr_min // 60}h {mttr_min % 60}m"
-    severity_label = "BREAKING" if event.is_breaking else event.severity.upper()
     routes_text = ", ".join(event.changed_routes) if event.changed_routes else "N/A"
-    source_repo_name = _repo_name(event.source_repo)
+    source_repo_name = repo_name(event.source_repo)
 
     content = [
-        _heading("Post-Incident Recovery Report", level=2),
-        _paragraph(_bold_text("Status: "), _text_node("RESOLVED — all services remediated")),
-        _generated_by_paragraph(),
-        _paragraph(_bold_text("Upstream source repo: "), _text_node(source_repo_name)),
-        _paragraph(_bold_text("Severity: "), _text_node(f"{severity_label} ({event.severity})")),
-        _paragraph(_bold_text("MTTR: "), _text_node(mttr_str)),
-        _paragraph(_bold_text("Summary: "), _text_node(event.summary or "Automated contract change recovery completed")),
-        _paragraph(_bold_text("Changed routes: "), _text_node(routes_text)),
-        _heading("Services Remediated", level=3),
+        _RECOVERY_HEADING,
+        _RECOVERY_STATUS,
+        _GENERATED_BY,
+        _paragraph(_label("Upstream source repo: "), _text_node(source_repo_name)),
+        _severity_paragraph(event.is_breaking, event.severity),
+        _paragraph(_label("MTTR: "), _text_node(format_mttr(event.mttr_seconds))),
+        _paragraph(_label("Summary: "), _text_node(event.summary or "Automated contract change recovery completed")),
+        _paragraph(_label("Changed routes: "), _text_node(routes_text)),
+        _SERVICES_REMEDIATED_HEADING,
         _bullet_list(*[
-            f"{job.target_service or _repo_name(job.target_repo)} ({job.target_repo or 'unknown repo'}) — {job.pr_url or 'no PR'}"
-            for job in event.jobs
-        ]) if event.jobs else _paragraph(_text_node("No jobs recorded")),
+            f"{job.service} ({job.target_repo or 'unknown repo'}) — {job.pr_url or 'no PR'}"
+            for job in job_rows(event)
+        ]) if event.jobs else _NO_JOBS_RECORDED,
     ]
 
     if billing_summary:
         total_revenue = billing_summary.get("total_revenue", 0)
         top_teams = billing_summary.get("top_teams", [])
-        content.append(_heading("Platform Cost Context", level=3))
-        content.append(_paragraph(_bold_text("Total platform spend: "), _text_node(f"${total_revenue:,.2f}")))
+        content.append(_COST_CONTEXT_HEADING)
+        content.append(_paragraph(_label("Total platform spend: "), _text_node(f"${total_revenue:,.2f}")))
         if top_teams:
             content.append(_bullet_list(*[
                 f"{team.get('team_name', team.get('team_id', '?'))}: ${team.get('total_cost', 0):,.2f} ({team.get('total_sessions', 0)} sessions)"
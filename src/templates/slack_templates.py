@@ -5,12 +5,11 @@ from __future__ import annotations
 import copy
 
 from src.schemas.events import NotificationBundle, PROpenedEvent, RecoveryCompleteEvent
+from src.templates._common import format_mttr, job_rows, repo_name, severity_label
 
 _SECTION_TEXT_LIMIT = 2900
-
-
-def _repo_name(repo_url: str) -> str:
-    return repo_url.rstrip("/").split("/")[-1] if repo_url else "unknown"
+# Indexed by ``event.is_breaking``.
+_SEVERITY_EMOJI = (":large_yellow_circle:", ":red_circle:")
 
 
 def _truncate(text: str, limit: int = _SECTION_TEXT_LIMIT) -> str:
@@ -57,14 +56,26 @@ def _links_section(
     }
 
 
-def _review_section() -> dict:
-    return {
-        "type": "section",
-        "text": {
-            "type": "mrkdwn",
-            "text": ":point_right: *Please review and merge this downstream PR to complete the remediation.*",
-        },
-    }
+# Fully static blocks are built once and shared between messages; they are
+# only ever serialized, never mutated.
+_REVIEW_SECTION = {
+    "type": "section",
+    "text": {
+        "type": "mrkdwn",
+        "text": ":point_right: *Please review and merge this downstream PR to complete the remediation.*",
+    },
+}
+_DIVIDER = {"type": "divider"}
+_GENERATED_BY_FIELD = {"type": "mrkdwn", "text": "*Generated by:*\nDevin via notification-service"}
+
+
+def _header(text: str) -> dict:
+    return {"type": "header", "text": {"type": "plain_text", "text": text, "emoji": True}}
+
+
+_PR_HEADER = _header("Devin Downstream Remediation PR Ready for Review")
+_BUNDLE_HEADER = _header("Devin Authored Remediation Update")
+_RECOVERY_HEADER = _header(":white_check_mark: Incident Resolved — Contract Recovery Complete")
 
 
 def build_pr_notification_text(
@@ -79,7 +90,7 @@ def build_pr_notification_text(
         f"Upstream source repo: {event.source_repo}",
         f"Downstream service: {event.target_service}",
         f"Downstream repo: {event.target_repo}",
-        f"Severity: {'BREAKING' if event.is_breaking else event.severity.upper()}",
+        f"Severity: {severity_label(event.is_breaking, event.severity)}",
         f"Summary: {event.devin_context.brief or event.summary or 'Upstream contract change detected'}",
         f"Downstream PR: {event.pr_url}",
         f"Devin session: {event.devin_session_url}",
@@ -95,30 +106,18 @@ def build_pr_notification(
     jira_issue_url: str | None = None,
 ) -> list[dict]:
     """Build Block Kit blocks for a PR-opened Slack notification."""
-    severity_emoji = ":red_circle:" if event.is_breaking else ":large_yellow_circle:"
-    severity_label = "BREAKING" if event.is_breaking else event.severity.upper()
-    source_repo_name = _repo_name(event.source_repo)
-    target_repo_name = _repo_name(event.target_repo)
+    source_repo_name = repo_name(event.source_repo)
+    target_repo_name = repo_name(event.target_repo)
     brief = event.devin_context.brief or event.summary or (
         "Upstream contract change detected; downstream remediation PR raised automatically."
     )
 
     blocks: list[dict] = [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "Devin Downstream Remediation PR Ready for Review",
-                "emoji": True,
-            },
-        },
+        _PR_HEADER,
         {
             "type": "section",
             "fields": [
-                {
-                    "type": "mrkdwn",
-                    "text": f"*Generated by:*\nDevin via notification-service",
-                },
+                _GENERATED_BY_FIELD,
                 {
                     "type": "mrkdwn",
                     "text": f"*Upstream source repo:*\n`{source_repo_name}`",
@@ -137,7 +136,7 @@ def build_pr_notification(
             "*Why this PR exists:*\n"
             f"An upstream contract change in `{source_repo_name}` affected `{event.target_service}`. "
             f"Devin opened the remediation PR in the downstream repo `{target_repo_name}`.\n\n"
-            f"*Severity:* {severity_emoji} {severity_label}\n"
+            f"*Severity:* {_SEVERITY_EMOJI[event.is_breaking]} {severity_label(event.is_breaking, event.severity)}\n"
             f"*Summary:*\n{brief}"
         ),
     ]
@@ -171,8 +170,8 @@ def build_pr_notification(
         ))
 
     blocks.append(_links_section(event, jira_issue_key, jira_issue_url))
-    blocks.append(_review_section())
-    blocks.append({"type": "divider"})
+    blocks.append(_REVIEW_SECTION)
+    blocks.append(_DIVIDER)
 
     return blocks
 
@@ -190,21 +189,11 @@ def build_pr_notification_from_bundle(
     if bundle_blocks:
         blocks = bundle_blocks
     else:
-        blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": "Devin Authored Remediation Update",
-                    "emoji": True,
-                },
-            },
-            _section(fallback_text),
-        ]
+        blocks = [_BUNDLE_HEADER, _section(fallback_text)]
 
     blocks.append(_links_section(event, jira_issue_key, jira_issue_url))
-    blocks.append(_review_section())
-    blocks.append({"type": "divider"})
+    blocks.append(_REVIEW_SECTION)
+    blocks.append(_DIVIDER)
     return blocks, fallback_text
 
 
@@ -213,18 +202,16 @@ def build_recovery_report_text(
     billing_summary: dict | None = None,
 ) -> str:
     """Plain-text fallback for the post-incident recovery report."""
-    mttr_min = event.mttr_seconds // 60
-    mttr_str = f"{mttr_min}m" if mttr_min < 60 else f"{mttr_min // 60}h {mttr_min % 60}m"
     job_lines = [
-        f"- {job.target_service or _repo_name(job.target_repo)} ({job.target_repo or 'unknown repo'}): {job.pr_url or 'resolved without PR'}"
-        for job in event.jobs
+        f"- {job.service} ({job.target_repo or 'unknown repo'}): {job.pr_url or 'resolved without PR'}"
+        for job in job_rows(event)
     ]
     lines = [
         "Incident resolved - contract recovery complete",
         "Generated by: Devin via notification-service",
         f"Upstream source repo: {event.source_repo}",
-        f"Severity: {'BREAKING' if event.is_breaking else event.severity.upper()}",
-        f"MTTR: {mttr_str}",
+        f"Severity: {severity_label(event.is_breaking, event.severity)}",
+        f"MTTR: {format_mttr(event.mttr_seconds)}",
         f"Services fixed: {event.total_jobs}",
         f"Summary: {event.summary or 'Contract change detected and remediated automatically.'}",
     ]
@@ -238,80 +225,76 @@ def build_recovery_report_text(
     return "\n".join(lines)
 
 
-def build_recovery_report(
-    event: RecoveryCompleteEvent,
-    billing_summary: dict | None = None,
-) -> list[dict]:
-    """Build Block Kit blocks for the post-incident recovery report."""
-    mttr_min = event.mttr_seconds // 60
-    mttr_str = f"{mttr_min}m" if mttr_min < 60 else f"{mttr_min // 60}h {mttr_min % 60}m"
-    severity_emoji = ":red_circle:" if event.is_breaking else ":large_yellow_circle:"
-    severity_label = "BREAKING" if event.is_breaking else event.severity.upper()
+def _recovery_facts_section(event: RecoveryCompleteEvent) -> dict:
     svc_list = ", ".join(event.affected_services) if event.affected_services else "unknown"
+    return {
+        "type": "section",
+        "fields": [
+            _GENERATED_BY_FIELD,
+            {"type": "mrkdwn", "text": f"*Upstream source repo:*\n`{repo_name(event.source_repo)}`"},
+            {"type": "mrkdwn", "text": f"*Severity:*\n{_SEVERITY_EMOJI[event.is_breaking]} {severity_label(event.is_breaking, event.severity)}"},
+            {"type": "mrkdwn", "text": f"*MTTR:*\n:stopwatch: {format_mttr(event.mttr_seconds)}"},
+            {"type": "mrkdwn", "text": f"*Services fixed:*\n{event.total_jobs}"},
+            {"type": "mrkdwn", "text": f"*Blast radius:*\n{svc_list}"},
+        ],
+    }
 
-    blocks: list[dict] = [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": ":white_check_mark: Incident Resolved — Contract Recovery Complete",
-                "emoji": True,
-            },
-        },
-        {
-            "type": "section",
-            "fields": [
-                {"type": "mrkdwn", "text": "*Generated by:*\nDevin via notification-service"},
-                {"type": "mrkdwn", "text": f"*Upstream source repo:*\n`{_repo_name(event.source_repo)}`"},
-                {"type": "mrkdwn", "text": f"*Severity:*\n{severity_emoji} {severity_label}"},
-                {"type": "mrkdwn", "text": f"*MTTR:*\n:stopwatch: {mttr_str}"},
-                {"type": "mrkdwn", "text": f"*Services fixed:*\n{event.total_jobs}"},
-                {"type": "mrkdwn", "text": f"*Blast radius:*\n{svc_list}"},
-            ],
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*What changed:*\n{event.summary or 'Contract change detected and remediated automatically.'}",
-            },
+
+def _recovery_summary_section(event: RecoveryCompleteEvent) -> dict:
+    return {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": f"*What changed:*\n{event.summary or 'Contract change detected and remediated automatically.'}",
         },
-    ]
+    }
 
-    if event.jobs:
-        pr_lines = "\n".join(
-            (
-                f"• `{job.target_service or _repo_name(job.target_repo)}` "
-                f"(`{_repo_name(job.target_repo)}`) — <{job.pr_url}|PR merged>"
-            )
-            if job.pr_url else
-            f"• `{job.target_service or _repo_name(job.target_repo)}` (`{_repo_name(job.target_repo)}`) — resolved"
-            for job in event.jobs
+
+def _recovery_jobs_section(event: RecoveryCompleteEvent) -> dict:
+    pr_lines = "\n".join(
+        (
+            f"• `{job.service}` "
+            f"(`{job.target_repo_name}`) — <{job.pr_url}|PR merged>"
         )
-        blocks.append({
-            "type": "section",
-            "text": {"type": "mrkdwn", "text": f"*Services remediated:*\n{pr_lines}"},
-        })
+        if job.pr_url else
+        f"• `{job.service}` (`{job.target_repo_name}`) — resolved"
+        for job in job_rows(event)
+    )
+    return {
+        "type": "section",
+        "text": {"type": "mrkdwn", "text": f"*Services remediated:*\n{pr_lines}"},
+    }
 
-    if event.changed_routes:
-        blocks.append(_section(
-            "*Changed routes:*\n"
-            f"{_bullets(event.changed_routes, limit=6, line_limit=220)}"
-        ))
 
-    if billing_summary:
-        total_revenue = billing_summary.get("total_revenue", 0)
-        top_teams = billing_summary.get("top_teams", [])
-        cost_lines = [f":moneybag: Platform total spend: *${total_revenue:,.2f}*"]
-        for team in top_teams[:3]:
-            cost_lines.append(
-                f"  • {team.get('team_name', '?')}: ${team.get('total_cost', 0):,.2f} "
-                f"({team.get('total_sessions', 0)} sessions)"
-            )
-        blocks.append({
-            "type": "section",
-            "text": {"type": "mrkdwn", "text": "\n".join(cost_lines)},
-        })
+def _billing_section(billing_summary: dict) -> dict:
+    total_revenue = billing_summary.get("total_revenue", 0)
+    top_teams = billing_summary.get("top_teams", [])
+    cost_lines = [f":moneybag: Platform total spend: *${total_revenue:,.2f}*"]
+    for team in top_teams[:3]:
+        cost_lines.append(
+            f"  • {team.get('team_name', '?')}: ${team.get('total_cost', 0):,.2f} "
+            f"({team.get('total_sessions', 0)} sessions)"
+        )
+    return {
+        "type": "section",
+        "text": {"type": "mrkdwn", "text": "\n".join(cost_lines)},
+    }
 
-    blocks.append({"type": "divider"})
-    return blocks
+
+def build_recovery_report(
+    event: RecoveryCompleteEvent,
+    billing_summary: dict | None = None,
+) -> list[dict]:
+    """Build Block Kit blocks for the post-incident recovery report."""
+    return [
+        _RECOVERY_HEADER,
+        _recovery_facts_section(event),
+        _recovery_summary_section(event),
+        *([_recovery_jobs_section(event)] if event.jobs else ()),
+        *(
+            [_section(f"*Changed routes:*\n{_bullets(event.changed_routes, limit=6, line_limit=220)}")]
+            if event.changed_routes else ()
+        ),
+        *([_billing_section(billing_summary)] if billing_summary else ()),
+        _DIVIDER,
+    ]
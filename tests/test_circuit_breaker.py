@@ -0,0 +1,115 @@
+"""Tests for the downstream circuit breaker."""
+
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from src.clients import circuit_breaker
+from src.clients.circuit_breaker import CircuitBreaker, CircuitOpenError, get_breaker
+from src.clients.jira_client import JiraClient
+from src.config import settings
+from src.database import async_session
+from src.handlers.event_handler import handle_pr_opened
+
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://x.atlassian.net/rest/api/3/issue")
+    return httpx.HTTPStatusError("boom", request=request, response=httpx.Response(status, request=request))
+
+
+async def test_opens_after_consecutive_outages_and_fails_fast():
+    breaker = CircuitBreaker("jira", fail_threshold=2, recovery_s=30)
+    calls = 0
+
+    async def _down():
+        nonlocal calls
+        calls += 1
+        raise _status_error(503)
+
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await breaker.call(_down)
+
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(_down)
+    assert calls == 2
+    assert breaker.state == "open"
+
+
+async def test_client_errors_do_not_trip_and_trial_call_closes(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now)
+    breaker = CircuitBreaker("jira", fail_threshold=1, recovery_s=30)
+
+    async def _not_found():
+        raise _status_error(404)
+
+    async def _down():
+        raise httpx.ConnectError("refused")
+
+    async def _ok():
+        return "ok"
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await breaker.call(_not_found)
+    assert breaker.state == "closed"
+
+    with pytest.raises(httpx.ConnectError):
+        await breaker.call(_down)
+    assert breaker.state == "open"
+
+    now += 30
+    assert breaker.state == "half_open"
+    assert await breaker.call(_ok) == "ok"
+    assert breaker.state == "closed"
+
+
+async def test_open_jira_circuit_skips_jira_but_still_sends_slack(
+    monkeypatch, make_pr_opened_event, make_notification_bundle,
+):
+    monkeypatch.setattr(settings, "jira_base_url", "https://x.atlassian.net")
+    monkeypatch.setattr(settings, "jira_api_token", "token")
+    monkeypatch.setattr(settings, "circuit_fail_threshold", 5)
+    jira_requests = 0
+
+    def _unauthorized(request: httpx.Request) -> httpx.Response:
+        nonlocal jira_requests
+        jira_requests += 1
+        return httpx.Response(401, json={"errorMessages": ["bad token"]})
+
+    jira = JiraClient(http=httpx.AsyncClient(transport=httpx.MockTransport(_unauthorized)))
+    mock_slack = AsyncMock()
+    mock_slack.send_message.return_value = {"ok": True}
+
+    results = []
+    for job_id in range(1, 8):
+        event = make_pr_opened_event(job_id=job_id, notification_bundle=make_notification_bundle())
+        async with async_session() as db:
+            results.append(await handle_pr_opened(db, event, jira, mock_slack))
+
+    assert jira_requests == 5
+    assert mock_slack.send_message.await_count == 7
+    assert all(result.status == "partial" for result in results)
+    assert "circuit open" in results[-1].errors[0]
+
+
+async def test_health_is_degraded_only_while_a_circuit_is_open(client, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now)
+    monkeypatch.setattr(settings, "circuit_fail_threshold", 1)
+    monkeypatch.setattr(settings, "circuit_recovery_seconds", 30)
+
+    async def _down():
+        raise httpx.ConnectError("refused")
+
+    with pytest.raises(httpx.ConnectError):
+        await get_breaker("jira").call(_down)
+    degraded = (await client.get("/health")).json()
+
+    now += 30
+    idle = (await client.get("/health")).json()
+
+    assert degraded["status"] == "degraded"
+    assert idle["status"] == "ok"
+    assert idle["circuits"] == {"jira": "half_open"}
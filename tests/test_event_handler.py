@@ -1,14 +1,19 @@
 """Tests for the event handler orchestration logic."""
 
-from unittest.mock import AsyncMock, Mock, patch
+import asyncio
+from unittest.mock import AsyncMock, Mock
 
+import pytest
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.background import drain_background_tasks
 from src.config import settings
 from src.database import async_session
-from src.handlers.event_handler import handle_pr_opened
+from src.handlers import event_handler
+from src.handlers.event_handler import accept_pr_opened, handle_pr_opened
 from src.models.jira_ticket import JiraTicket
-from src.schemas.events import PROpenedEvent
+from src.models.notification_event import NotificationEvent
 
 
 def _extract_adf_text(node: dict | list) -> str:
@@ -22,86 +27,34 @@ def _extract_adf_text(node: dict | list) -> str:
     return " ".join(part for part in (text, child_text) if part)
 
 
-def _sample_notification_bundle(**overrides) -> dict:
-    payload = {
-        "author": "devin",
-        "assertions": {
-            "source_repo": "https://github.com/MadhuvanthiSriPad/api-core",
-            "target_repo": "https://github.com/MadhuvanthiSriPad/billing-service",
-            "target_service": "billing-service",
-            "pr_url": "https://github.com/MadhuvanthiSriPad/billing-service/pull/1",
-        },
-        "jira": {
-            "summary": "Devin-authored Jira summary",
-            "description_text": "Devin-authored Jira description\n\n- check billing gateway\n- verify invoice tests",
-        },
-        "slack": {
-            "text": "Devin-authored Slack text",
-            "blocks": [],
-        },
-    }
-    payload.update(overrides)
-    return payload
-
-
-def _sample_event(**overrides) -> PROpenedEvent:
-    defaults = {
-        "event_type": "pr_opened",
-        "change_id": 1,
-        "job_id": 10,
-        "timestamp": "2026-02-28T10:30:00Z",
-        "source_repo": "https://github.com/MadhuvanthiSriPad/api-core",
-        "target_repo": "https://github.com/MadhuvanthiSriPad/billing-service",
-        "target_service": "billing-service",
-        "pr_url": "https://github.com/MadhuvanthiSriPad/billing-service/pull/1",
-        "devin_session_url": "https://app.devin.ai/sessions/sess_1",
-        "severity": "high",
-        "is_breaking": True,
-        "summary": "test change",
-        "changed_routes": ["POST /sessions"],
-    }
-    defaults.update(overrides)
-    return PROpenedEvent(**defaults)
-
-
-async def test_both_services_fail_returns_failed():
+async def test_both_services_fail_returns_failed(make_pr_opened_event, make_notification_bundle):
     """Both Jira and Slack fail — status is 'failed'."""
     mock_jira = AsyncMock()
     mock_jira.create_issue.side_effect = RuntimeError("jira down")
-    mock_jira.close = AsyncMock()
 
     mock_slack = AsyncMock()
     mock_slack.send_message.side_effect = RuntimeError("slack down")
-    mock_slack.close = AsyncMock()
 
-    with (
-        patch("src.handlers.event_handler.JiraClient", return_value=mock_jira),
-        patch("src.handlers.event_handler.SlackClient", return_value=mock_slack),
-    ):
-        async with async_session() as db:
-            result = await handle_pr_opened(db, _sample_event(notification_bundle=_sample_notification_bundle()))
+    event = make_pr_opened_event(notification_bundle=make_notification_bundle())
+    async with async_session() as db:
+        result = await handle_pr_opened(db, event, mock_jira, mock_slack)
 
     assert result.status == "failed"
     assert len(result.errors) == 2
 
 
-async def test_jira_ticket_persisted():
+async def test_jira_ticket_persisted(make_pr_opened_event, make_notification_bundle):
     """On success, JiraTicket row is created."""
     mock_jira = AsyncMock()
     mock_jira.create_issue.return_value = {"key": "ACCR-1"}
     mock_jira.browse_url = Mock(return_value="https://x.atlassian.net/browse/ACCR-1")
-    mock_jira.close = AsyncMock()
 
     mock_slack = AsyncMock()
     mock_slack.send_message.return_value = {"ok": True}
-    mock_slack.close = AsyncMock()
 
-    with (
-        patch("src.handlers.event_handler.JiraClient", return_value=mock_jira),
-        patch("src.handlers.event_handler.SlackClient", return_value=mock_slack),
-    ):
-        async with async_session() as db:
-            await handle_pr_opened(db, _sample_event(notification_bundle=_sample_notification_bundle()))
+    event = make_pr_opened_event(notification_bundle=make_notification_bundle())
+    async with async_session() as db:
+        await handle_pr_opened(db, event, mock_jira, mock_slack)
 
     async with async_session() as db:
         result = await db.execute(select(JiraTicket))
@@ -109,25 +62,45 @@ async def test_jira_ticket_persisted():
         assert ticket.jira_issue_key == "ACCR-1"
         assert ticket.job_id == 10
 
+        record = (await db.execute(select(NotificationEvent))).scalar_one()
+        assert record.jira_sent is True
+        assert record.slack_sent is True
+        assert len(record.payload_sha256) == 64
 
-async def test_valid_notification_bundle_is_used_for_jira_and_slack():
+
+async def test_duplicate_fast_path_skips_database(make_pr_opened_event, make_notification_bundle):
+    """A duplicate this process already claimed never touches the session."""
+    mock_jira = AsyncMock()
+    mock_jira.create_issue.return_value = {"key": "ACCR-1"}
+    mock_jira.browse_url = Mock(return_value="https://x.atlassian.net/browse/ACCR-1")
+
+    mock_slack = AsyncMock()
+    mock_slack.send_message.return_value = {"ok": True}
+
+    event = make_pr_opened_event(notification_bundle=make_notification_bundle())
+    async with async_session() as db:
+        await handle_pr_opened(db, event, mock_jira, mock_slack)
+
+    untouched_db = Mock(spec=AsyncSession)
+    duplicate = await handle_pr_opened(untouched_db, event, mock_jira, mock_slack)
+
+    assert duplicate.status == "already_processed"
+    assert untouched_db.mock_calls == []
+    assert mock_jira.create_issue.call_count == 1
+
+
+async def test_valid_notification_bundle_is_used_for_jira_and_slack(make_pr_opened_event, make_notification_bundle):
     mock_jira = AsyncMock()
     mock_jira.create_issue.return_value = {"key": "ACCR-77"}
     mock_jira.browse_url = Mock(return_value="https://x.atlassian.net/browse/ACCR-77")
-    mock_jira.close = AsyncMock()
 
     mock_slack = AsyncMock()
     mock_slack.send_message.return_value = {"ok": True}
-    mock_slack.close = AsyncMock()
 
-    event = _sample_event(notification_bundle=_sample_notification_bundle())
+    event = make_pr_opened_event(notification_bundle=make_notification_bundle())
 
-    with (
-        patch("src.handlers.event_handler.JiraClient", return_value=mock_jira),
-        patch("src.handlers.event_handler.SlackClient", return_value=mock_slack),
-    ):
-        async with async_session() as db:
-            await handle_pr_opened(db, event)
+    async with async_session() as db:
+        await handle_pr_opened(db, event, mock_jira, mock_slack)
 
     jira_fields = mock_jira.create_issue.await_args.args[0]
     slack_blocks = mock_slack.send_message.await_args.args[0]
@@ -140,15 +113,15 @@ async def test_valid_notification_bundle_is_used_for_jira_and_slack():
     assert slack_blocks[0]["type"] == "header"
 
 
-async def test_billing_service_uses_repo_specific_jira_project(monkeypatch):
+async def test_billing_service_uses_repo_specific_jira_project(
+    monkeypatch, make_pr_opened_event, make_notification_bundle,
+):
     mock_jira = AsyncMock()
     mock_jira.create_issue.return_value = {"key": "BS-77"}
     mock_jira.browse_url = Mock(return_value="https://x.atlassian.net/browse/BS-77")
-    mock_jira.close = AsyncMock()
 
     mock_slack = AsyncMock()
     mock_slack.send_message.return_value = {"ok": True}
-    mock_slack.close = AsyncMock()
 
     monkeypatch.setattr(settings, "jira_project_key", "AC")
     monkeypatch.setattr(
@@ -162,29 +135,23 @@ async def test_billing_service_uses_repo_specific_jira_project(monkeypatch):
         },
     )
 
-    event = _sample_event(notification_bundle=_sample_notification_bundle())
+    event = make_pr_opened_event(notification_bundle=make_notification_bundle())
 
-    with (
-        patch("src.handlers.event_handler.JiraClient", return_value=mock_jira),
-        patch("src.handlers.event_handler.SlackClient", return_value=mock_slack),
-    ):
-        async with async_session() as db:
-            await handle_pr_opened(db, event)
+    async with async_session() as db:
+        await handle_pr_opened(db, event, mock_jira, mock_slack)
 
     jira_fields = mock_jira.create_issue.await_args.args[0]
 
     assert jira_fields["project"] == {"key": "BS"}
 
 
-async def test_invalid_notification_bundle_skips_jira_and_keeps_slack_fallback():
+async def test_invalid_notification_bundle_skips_jira_and_keeps_slack_fallback(make_pr_opened_event):
     mock_jira = AsyncMock()
-    mock_jira.close = AsyncMock()
 
     mock_slack = AsyncMock()
     mock_slack.send_message.return_value = {"ok": True}
-    mock_slack.close = AsyncMock()
 
-    event = _sample_event(notification_bundle={
+    event = make_pr_opened_event(notification_bundle={
         "author": "devin",
         "assertions": {
             "source_repo": "https://github.com/MadhuvanthiSriPad/api-core",
@@ -202,12 +169,8 @@ async def test_invalid_notification_bundle_skips_jira_and_keeps_slack_fallback()
         },
     })
 
-    with (
-        patch("src.handlers.event_handler.JiraClient", return_value=mock_jira),
-        patch("src.handlers.event_handler.SlackClient", return_value=mock_slack),
-    ):
-        async with async_session() as db:
-            result = await handle_pr_opened(db, event)
+    async with async_session() as db:
+        result = await handle_pr_opened(db, event, mock_jira, mock_slack)
 
     slack_text = mock_slack.send_message.await_args.kwargs["text"]
 
@@ -216,3 +179,119 @@ async def test_invalid_notification_bundle_skips_jira_and_keeps_slack_fallback()
     assert result.errors == ["jira: invalid Devin-authored notification bundle"]
     assert mock_jira.create_issue.await_count == 0
     assert slack_text != "Wrong Slack text"
+
+
+async def test_jira_and_slack_run_concurrently_then_slack_links_ticket(make_pr_opened_event, make_notification_bundle):
+    """Slack is posted while Jira is in flight, then updated with the Jira link."""
+    slack_posted = asyncio.Event()
+
+    async def _create_issue(_fields):
+        await asyncio.wait_for(slack_posted.wait(), timeout=1)
+        return {"key": "ACCR-5"}
+
+    async def _send_message(_blocks, text=""):
+        slack_posted.set()
+        return {"ok": True, "channel": "C123", "ts": "1700000000.000100"}
+
+    mock_jira = AsyncMock()
+    mock_jira.create_issue.side_effect = _create_issue
+    mock_jira.browse_url = Mock(return_value="https://x.atlassian.net/browse/ACCR-5")
+
+    mock_slack = AsyncMock()
+    mock_slack.send_message.side_effect = _send_message
+    mock_slack.update_message.return_value = {"ok": True}
+
+    event = make_pr_opened_event(notification_bundle=make_notification_bundle())
+    async with async_session() as db:
+        result = await handle_pr_opened(db, event, mock_jira, mock_slack)
+    await drain_background_tasks()
+
+    assert result.status == "processed"
+    channel, ts, blocks = mock_slack.update_message.await_args.args
+    assert (channel, ts) == ("C123", "1700000000.000100")
+    assert "https://x.atlassian.net/browse/ACCR-5" in str(blocks)
+
+
+async def test_accept_pr_opened_returns_before_delivery(make_pr_opened_event, make_notification_bundle):
+    """The event is claimed and acknowledged; Jira and Slack run afterwards."""
+    release_slack = asyncio.Event()
+
+    async def _send_message(_blocks, text=""):
+        await release_slack.wait()
+        return {"ok": True}
+
+    mock_jira = AsyncMock()
+    mock_jira.create_issue.return_value = {"key": "ACCR-9"}
+    mock_jira.browse_url = Mock(return_value="https://x.atlassian.net/browse/ACCR-9")
+
+    mock_slack = AsyncMock()
+    mock_slack.send_message.side_effect = _send_message
+
+    event = make_pr_opened_event(notification_bundle=make_notification_bundle())
+    async with async_session() as db:
+        result = await accept_pr_opened(db, event, mock_jira, mock_slack)
+    async with async_session() as db:
+        duplicate = await accept_pr_opened(db, event, mock_jira, mock_slack)
+
+    assert result.status == "accepted"
+    assert duplicate.status == "already_processed"
+
+    release_slack.set()
+    await drain_background_tasks()
+
+    async with async_session() as db:
+        record = (await db.execute(select(NotificationEvent))).scalar_one()
+        assert record.jira_sent is True
+        assert record.slack_sent is True
+        ticket = (await db.execute(select(JiraTicket))).scalar_one()
+        assert ticket.jira_issue_key == "ACCR-9"
+
+
+async def test_no_transaction_is_held_across_network_calls(make_pr_opened_event, make_notification_bundle):
+    async with async_session() as db:
+        in_transaction: list[bool] = []
+
+        async def _create_issue(_fields):
+            in_transaction.append(db.in_transaction())
+            return {"key": "ACCR-3"}
+
+        async def _send_message(_blocks, text=""):
+            in_transaction.append(db.in_transaction())
+            return {"ok": True}
+
+        mock_jira = AsyncMock()
+        mock_jira.create_issue.side_effect = _create_issue
+        mock_jira.browse_url = Mock(return_value="https://x.atlassian.net/browse/ACCR-3")
+        mock_slack = AsyncMock()
+        mock_slack.send_message.side_effect = _send_message
+
+        event = make_pr_opened_event(notification_bundle=make_notification_bundle())
+        result = await handle_pr_opened(db, event, mock_jira, mock_slack)
+
+    assert result.status == "processed"
+    assert in_transaction == [False, False]
+
+
+async def test_claim_is_released_when_sending_raises(monkeypatch, make_pr_opened_event, make_notification_bundle):
+    """An event that never went out can be retried instead of being deduplicated away."""
+    mock_jira = AsyncMock()
+    mock_jira.create_issue.return_value = {"key": "ACCR-4"}
+    mock_jira.browse_url = Mock(return_value="https://x.atlassian.net/browse/ACCR-4")
+    mock_slack = AsyncMock()
+    mock_slack.send_message.return_value = {"ok": True}
+    event = make_pr_opened_event(notification_bundle=make_notification_bundle())
+
+    async def _broken_send(*_args):
+        raise RuntimeError("template bug")
+
+    monkeypatch.setattr(event_handler, "_send_pr_opened", _broken_send)
+    async with async_session() as db:
+        with pytest.raises(RuntimeError, match="template bug"):
+            await handle_pr_opened(db, event, mock_jira, mock_slack)
+    monkeypatch.undo()
+
+    async with async_session() as db:
+        retry = await handle_pr_opened(db, event, mock_jira, mock_slack)
+
+    assert retry.status == "processed"
+    assert mock_jira.create_issue.await_count == 1
@@ -0,0 +1,28 @@
+"""Tests for the shared outbound HTTP client pool."""
+
+from src.clients.http_pool import close_http_clients, get_http_client
+from src.clients.jira_client import JiraClient
+from src.config import settings
+
+
+async def test_jira_clients_share_one_pooled_http_client(monkeypatch):
+    """Per-webhook JiraClient instances reuse the same keep-alive pool."""
+    monkeypatch.setattr(settings, "jira_base_url", "https://x.atlassian.net")
+    monkeypatch.setattr(settings, "jira_api_token", "token")
+
+    first = JiraClient()
+    second = JiraClient()
+
+    assert first._client is second._client
+    assert first._client is get_http_client("jira")
+    await close_http_clients()
+
+
+async def test_close_http_clients_resets_pool():
+    client = get_http_client("slack")
+
+    await close_http_clients()
+
+    assert client.is_closed
+    assert get_http_client("slack") is not client
+    await close_http_clients()
@@ -0,0 +1,50 @@
+"""Tests for the Jira Cloud REST API client."""
+
+import asyncio
+
+import httpx
+
+from src.clients.jira_client import JiraClient
+from src.config import settings
+
+
+async def test_add_comments_reports_per_issue_outcomes(monkeypatch):
+    monkeypatch.setattr(settings, "jira_base_url", "https://x.atlassian.net")
+    monkeypatch.setattr(settings, "jira_api_token", "token")
+    paths: list[str] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        status = 404 if "AC-2" in request.url.path else 201
+        return httpx.Response(status, json={"id": "1"})
+
+    http = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+    outcomes = await JiraClient(http=http).add_comments(["AC-1", "AC-2"], {"type": "doc"})
+
+    assert outcomes["AC-1"] is None
+    assert isinstance(outcomes["AC-2"], httpx.HTTPStatusError)
+    assert sorted(paths) == [
+        "/rest/api/3/issue/AC-1/comment",
+        "/rest/api/3/issue/AC-2/comment",
+    ]
+
+
+async def test_requests_in_flight_are_capped_across_callers(monkeypatch):
+    monkeypatch.setattr(settings, "jira_base_url", "https://x.atlassian.net")
+    monkeypatch.setattr(settings, "jira_api_token", "token")
+    monkeypatch.setattr(settings, "jira_max_in_flight", 2)
+    in_flight = peak = 0
+
+    async def _handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(201, json={"key": "AC-1"})
+
+    jira = JiraClient(http=httpx.AsyncClient(transport=httpx.MockTransport(_handler)))
+    results = await asyncio.gather(*(jira.create_issue({"summary": str(i)}) for i in range(10)))
+
+    assert len(results) == 10
+    assert peak == 2
@@ -0,0 +1,103 @@
+"""Tests for the recovery_complete handler."""
+
+from unittest.mock import AsyncMock
+
+from sqlalchemy import select
+
+from src.database import async_session
+from src.handlers.recovery_report import handle_recovery_complete
+from src.models.jira_ticket import JiraTicket
+from src.models.notification_event import NotificationEvent
+from src.schemas.events import RecoveryCompleteEvent
+
+
+def _sample_event(**overrides) -> RecoveryCompleteEvent:
+    defaults = {
+        "change_id": 1,
+        "timestamp": "2026-02-28T12:00:00Z",
+        "summary": "Added required sla_tier field",
+        "affected_services": ["billing-service"],
+        "total_jobs": 2,
+        "jobs": [
+            {"job_id": 10, "target_service": "billing-service"},
+            {"job_id": 11, "target_service": "dashboard-service"},
+        ],
+        "mttr_seconds": 5400,
+    }
+    defaults.update(overrides)
+    return RecoveryCompleteEvent(**defaults)
+
+
+async def _seed_tickets(*keys: str) -> None:
+    async with async_session() as db, db.begin():
+        for job_id, key in enumerate(keys, start=10):
+            db.add(JiraTicket(
+                change_id=1,
+                job_id=job_id,
+                jira_issue_key=key,
+                jira_issue_url=f"https://x.atlassian.net/browse/{key}",
+            ))
+
+
+async def test_comment_failure_is_partial_and_duplicate_is_skipped():
+    await _seed_tickets("BS-1", "DS-2")
+    mock_jira = AsyncMock()
+    mock_jira.add_comments.return_value = {"BS-1": None, "DS-2": RuntimeError("gone")}
+    mock_slack = AsyncMock()
+    mock_slack.send_message.return_value = {"ok": True}
+
+    async with async_session() as db:
+        result = await handle_recovery_complete(db, _sample_event(), mock_jira, mock_slack)
+    async with async_session() as db:
+        duplicate = await handle_recovery_complete(db, _sample_event(), mock_jira, mock_slack)
+
+    assert result.status == "partial"
+    assert result.jira_issue_key == "BS-1"
+    assert result.slack_sent is True
+    assert result.errors == ["jira_comment:DS-2: gone"]
+    assert sorted(mock_jira.add_comments.await_args.args[0]) == ["BS-1", "DS-2"]
+    assert duplicate.status == "already_processed"
+    assert mock_slack.send_message.await_count == 1
+
+    async with async_session() as db:
+        record = (await db.execute(select(NotificationEvent))).scalar_one()
+        assert record.idempotency_key == "recovery_complete:1"
+        assert record.jira_sent is True
+        assert record.slack_sent is True
+
+
+async def test_slack_failure_without_tickets_is_failed():
+    mock_jira = AsyncMock()
+    mock_slack = AsyncMock()
+    mock_slack.send_message.side_effect = RuntimeError("slack down")
+
+    async with async_session() as db:
+        result = await handle_recovery_complete(db, _sample_event(), mock_jira, mock_slack)
+
+    assert result.status == "failed"
+    assert result.errors == ["slack: slack down"]
+    assert mock_jira.add_comments.await_count == 0
+
+
+async def test_no_transaction_is_held_across_network_calls():
+    await _seed_tickets("BS-1")
+    async with async_session() as db:
+        in_transaction: list[bool] = []
+
+        async def _add_comments(issue_keys, _body):
+            in_transaction.append(db.in_transaction())
+            return {key: None for key in issue_keys}
+
+        async def _send_message(_blocks, text=""):
+            in_transaction.append(db.in_transaction())
+            return {"ok": True}
+
+        mock_jira = AsyncMock()
+        mock_jira.add_comments.side_effect = _add_comments
+        mock_slack = AsyncMock()
+        mock_slack.send_message.side_effect = _send_message
+
+        result = await handle_recovery_complete(db, _sample_event(), mock_jira, mock_slack)
+
+    assert result.status == "processed"
+    assert in_transaction == [False, False]
@@ -0,0 +1,52 @@
+"""Tests for the Slack Web API client."""
+
+import httpx
+import orjson
+import pytest
+
+from src.clients.slack_client import SlackClient
+from src.config import settings
+
+
+def _slack_client(monkeypatch, responses: list[dict], requests: list[dict]) -> SlackClient:
+    monkeypatch.setattr(settings, "slack_bot_token", "xoxb-test")
+    monkeypatch.setattr(settings, "slack_channel", "C123")
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        requests.append(orjson.loads(request.content))
+        return httpx.Response(200, json=responses[len(requests) - 1])
+
+    http = httpx.AsyncClient(base_url="https://slack.com", transport=httpx.MockTransport(_handler))
+    return SlackClient(http=http)
+
+
+async def test_malformed_blocks_are_dropped_before_sending(monkeypatch):
+    requests: list[dict] = []
+    slack = _slack_client(monkeypatch, [{"ok": True}], requests)
+
+    await slack.send_message([{"text": "no type"}], text="fallback")
+
+    assert requests == [{"channel": "C123", "text": "fallback"}]
+
+
+async def test_invalid_blocks_rejection_falls_back_to_text_once(monkeypatch):
+    requests: list[dict] = []
+    slack = _slack_client(monkeypatch, [{"ok": False, "error": "invalid_blocks"}, {"ok": True}], requests)
+
+    data = await slack.send_message([{"type": "section"}], text="fallback")
+
+    assert data["ok"] is True
+    assert requests == [
+        {"channel": "C123", "text": "fallback", "blocks": [{"type": "section"}]},
+        {"channel": "C123", "text": "fallback"},
+    ]
+
+
+async def test_other_slack_errors_are_not_retried(monkeypatch):
+    requests: list[dict] = []
+    slack = _slack_client(monkeypatch, [{"ok": False, "error": "channel_not_found"}], requests)
+
+    with pytest.raises(RuntimeError, match="channel_not_found"):
+        await slack.send_message([{"type": "section"}], text="fallback")
+
+    assert len(requests) == 1
@@ -1,10 +1,19 @@
 """Tests for the webhook endpoint."""
 
+import asyncio
+
+import orjson
 import pytest
-from unittest.mock import AsyncMock, Mock, patch
-from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
+from src.background import drain_background_tasks
+from src.config import settings
+from src.database import Base, async_session, engine, get_db
+from src.handlers import event_handler
 from src.main import app
+from src.models.jira_ticket import JiraTicket
+from src.models.notification_event import NotificationEvent
 
 
 SAMPLE_EVENT = {
@@ -41,52 +50,12 @@ SAMPLE_EVENT = {
 }
 
 
-async def test_pr_opened_creates_jira_and_slack():
-    """Happy path: Jira + Slack both succeed."""
-    mock_jira = AsyncMock()
-    mock_jira.create_issue.return_value = {"key": "ACCR-42", "self": "..."}
-    mock_jira.browse_url = Mock(return_value="https://yourco.atlassian.net/browse/ACCR-42")
-    mock_jira.close = AsyncMock()
-
-    mock_slack = AsyncMock()
-    mock_slack.send_message.return_value = {"ok": True}
-    mock_slack.close = AsyncMock()
-
-    with (
-        patch("src.handlers.event_handler.JiraClient", return_value=mock_jira),
-        patch("src.handlers.event_handler.SlackClient", return_value=mock_slack),
-    ):
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            resp = await client.post("/api/v1/webhooks/pr-opened", json=SAMPLE_EVENT)
-
-    assert resp.status_code == 200
-    data = resp.json()
-    assert data["status"] == "processed"
-    assert data["jira_issue_key"] == "ACCR-42"
-    assert data["slack_sent"] is True
-    assert data["errors"] == []
-
-
-async def test_duplicate_webhook_is_idempotent():
+async def test_duplicate_webhook_is_idempotent(client, mocked_clients):
     """Same job_id sent twice returns already_processed."""
-    mock_jira = AsyncMock()
-    mock_jira.create_issue.return_value = {"key": "ACCR-42"}
-    mock_jira.browse_url = Mock(return_value="https://yourco.atlassian.net/browse/ACCR-42")
-    mock_jira.close = AsyncMock()
-
-    mock_slack = AsyncMock()
-    mock_slack.send_message.return_value = {"ok": True}
-    mock_slack.close = AsyncMock()
-
-    with (
-        patch("src.handlers.event_handler.JiraClient", return_value=mock_jira),
-        patch("src.handlers.event_handler.SlackClient", return_value=mock_slack),
-    ):
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            resp1 = await client.post("/api/v1/webhooks/pr-opened", json=SAMPLE_EVENT)
-            resp2 = await client.post("/api/v1/webhooks/pr-opened", json=SAMPLE_EVENT)
+    mock_jira, _ = mocked_clients
+
+    resp1 = await client.post("/api/v1/webhooks/pr-opened", json=SAMPLE_EVENT)
+    resp2 = await client.post("/api/v1/webhooks/pr-opened", json=SAMPLE_EVENT)
 
     assert resp1.status_code == 200
     assert resp1.json()["status"] == "processed"
@@ -97,34 +66,312 @@ async def test_duplicate_webhook_is_idempotent():
     assert mock_jira.create_issue.call_count == 1
 
 
-async def test_jira_failure_does_not_block_slack():
-    """Jira fails, Slack still sends — partial status."""
-    mock_jira = AsyncMock()
-    mock_jira.create_issue.side_effect = RuntimeError("Jira unreachable")
-    mock_jira.close = AsyncMock()
+@pytest.fixture
+async def file_db(tmp_path):
+    """Serve requests from a file-backed SQLite database with a real connection pool.
+
+    Unlike the shared in-memory database, each session gets its own
+    connection, so concurrent requests run in separate transactions.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'race.db'}", connect_args={"timeout": 30})
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+
+    async def _get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = _get_db
+    yield session_factory
+    app.dependency_overrides.pop(get_db, None)
+    await engine.dispose()
+
+
+async def test_duplicate_webhook_concurrent(client, mocked_clients, file_db):
+    """Two simultaneous deliveries of one job_id, in separate transactions, create one Jira issue."""
+    mock_jira, _ = mocked_clients
+
+    async def _create_issue(_fields):
+        # Keep the first delivery in flight while the second request claims.
+        await asyncio.sleep(0.05)
+        return {"key": "ACCR-42"}
+
+    mock_jira.create_issue.side_effect = _create_issue
+
+    responses = await asyncio.gather(
+        client.post("/api/v1/webhooks/pr-opened", json=SAMPLE_EVENT),
+        client.post("/api/v1/webhooks/pr-opened", json=SAMPLE_EVENT),
+    )
+
+    assert sorted(resp.json()["status"] for resp in responses) == ["already_processed", "processed"]
+    assert mock_jira.create_issue.call_count == 1
+    async with file_db() as db:
+        assert (await db.scalars(select(NotificationEvent.job_id))).all() == [42]
+
+
+@pytest.mark.parametrize(
+    ("jira_ok", "slack_ok", "status", "error_count"),
+    [
+        (True, True, "processed", 0),
+        (False, True, "partial", 1),
+        (True, False, "partial", 1),
+        (False, False, "failed", 2),
+    ],
+)
+async def test_pr_opened_outcome_matrix(client, mocked_clients, jira_ok, slack_ok, status, error_count):
+    """Jira and Slack failures are reported independently; neither blocks the other."""
+    mock_jira, mock_slack = mocked_clients
+    if not jira_ok:
+        mock_jira.create_issue.side_effect = RuntimeError("Jira unreachable")
+    if not slack_ok:
+        mock_slack.send_message.side_effect = RuntimeError("Slack unreachable")
+
+    resp = await client.post("/api/v1/webhooks/pr-opened", json=SAMPLE_EVENT)
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["status"] == status
+    assert len(data["errors"]) == error_count
+    assert data["slack_sent"] is slack_ok
+    assert data["jira_issue_key"] == ("ACCR-42" if jira_ok else None)
+    assert mock_jira.create_issue.await_count == 1
+    assert mock_slack.send_message.await_count == 1
+
+
+async def test_pr_opened_accepts_immediately(client, mocked_clients):
+    """?sync=false answers 202 before Slack delivery has finished."""
+    _, mock_slack = mocked_clients
+    release_slack = asyncio.Event()
+
+    async def _send_message(*args, **kwargs):
+        await release_slack.wait()
+        return {"ok": True}
+
+    mock_slack.send_message.side_effect = _send_message
+
+    # Bounded, so a route that waits for delivery fails instead of hanging.
+    resp = await asyncio.wait_for(
+        client.post("/api/v1/webhooks/pr-opened?sync=false", json=SAMPLE_EVENT),
+        timeout=2,
+    )
+    release_slack.set()
+    await drain_background_tasks()
+
+    assert resp.status_code == 202
+    assert resp.json()["status"] == "accepted"
+    assert resp.json()["job_id"] == 42
+    assert mock_slack.send_message.await_count == 1
+
+
+async def test_pr_opened_batch(client, mocked_clients):
+    mock_jira, _ = mocked_clients
+    mock_jira.create_issue.side_effect = [{"key": "ACCR-42"}, {"key": "ACCR-43"}]
+    statements: list[str] = []
+
+    def _record(_conn, _cursor, statement, _parameters, _context, _executemany):
+        statements.append(statement.split(None, 3)[:3])
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        resp = await client.post(
+            "/api/v1/webhooks/pr-opened/batch",
+            json=[SAMPLE_EVENT, {**SAMPLE_EVENT, "job_id": 43}, SAMPLE_EVENT],
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _record)
+
+    assert resp.status_code == 200
+    assert [item["status"] for item in resp.json()] == ["processed", "processed", "already_processed"]
+    assert mock_jira.create_issue.call_count == 2
+    # One claim per new event, then a single bulk write each for tickets and outcomes.
+    assert statements.count(["INSERT", "INTO", "notification_events"]) == 2
+    assert statements.count(["INSERT", "INTO", "jira_tickets"]) == 1
+    assert statements.count(["UPDATE", "notification_events", "SET"]) == 1
+
+    async with async_session() as db:
+        tickets = (await db.scalars(select(JiraTicket.job_id))).all()
+        records = (await db.scalars(select(NotificationEvent))).all()
+    assert sorted(tickets) == [42, 43]
+    assert [(r.job_id, r.jira_sent, r.slack_sent) for r in sorted(records, key=lambda r: r.job_id)] == [
+        (42, True, True),
+        (43, True, True),
+    ]
+
+
+async def test_pr_opened_ndjson_stream(client, mocked_clients, file_db, monkeypatch):
+    # Streamed events each open their own session; the file-backed database
+    # gives each one its own connection, so their handlers overlap.  SQLite
+    # still serialises the write transactions themselves.
+    monkeypatch.setattr(event_handler, "async_session", file_db)
+    mock_jira, _ = mocked_clients
+    handle_pr_opened = event_handler.handle_pr_opened
+    in_flight = peak = 0
 
-    mock_slack = AsyncMock()
-    mock_slack.send_message.return_value = {"ok": True}
-    mock_slack.close = AsyncMock()
+    async def _handle(db, event, jira, slack):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            return await handle_pr_opened(db, event, jira, slack)
+        finally:
+            in_flight -= 1
 
-    with (
-        patch("src.handlers.event_handler.JiraClient", return_value=mock_jira),
-        patch("src.handlers.event_handler.SlackClient", return_value=mock_slack),
-    ):
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            resp = await client.post("/api/v1/webhooks/pr-opened", json=SAMPLE_EVENT)
+    async def _create_issue(fields):
+        await asyncio.sleep(0.02)
+        return {"key": "ACCR-1"}
 
+    monkeypatch.setattr(event_handler, "handle_pr_opened", _handle)
+    mock_jira.create_issue.side_effect = _create_issue
+    body = b"\n".join([
+        orjson.dumps(SAMPLE_EVENT),
+        b"",
+        orjson.dumps({**SAMPLE_EVENT, "job_id": "not-a-number"}),
+        orjson.dumps({**SAMPLE_EVENT, "job_id": 43}),
+        orjson.dumps({**SAMPLE_EVENT, "job_id": 44}),
+    ])
+
+    resp = await client.post(
+        "/api/v1/webhooks/pr-opened/ndjson",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [item["status"] for item in data] == ["processed", "failed", "processed", "processed"]
+    assert data[1]["errors"][0].startswith("invalid event: job_id:")
+    assert mock_jira.create_issue.call_count == 3
+    assert peak > 1
+    async with file_db() as db:
+        assert sorted((await db.scalars(select(NotificationEvent.job_id))).all()) == [42, 43, 44]
+
+
+async def test_pr_opened_ndjson_reports_oversized_lines_and_handler_errors(client, mocked_clients, monkeypatch):
+    monkeypatch.setattr(settings, "webhook_batch_concurrency", 1)
+    handle_pr_opened = event_handler.handle_pr_opened
+
+    async def _handle(db, event, jira, slack):
+        if event.job_id == 44:
+            raise RuntimeError("database unavailable")
+        return await handle_pr_opened(db, event, jira, slack)
+
+    monkeypatch.setattr(event_handler, "handle_pr_opened", _handle)
+    oversized = b"x" * (settings.ndjson_max_line_bytes + 1)
+
+    async def _body():
+        yield orjson.dumps(SAMPLE_EVENT) + b"\n"
+        # An oversized line split across chunks is skipped up to its newline.
+        yield oversized[:1000]
+        yield oversized[1000:]
+        yield b"still the oversized line\n" + orjson.dumps({**SAMPLE_EVENT, "job_id": 43}) + b"\n"
+        yield orjson.dumps({**SAMPLE_EVENT, "job_id": 44})
+
+    resp = await client.post(
+        "/api/v1/webhooks/pr-opened/ndjson",
+        content=_body(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert resp.status_code == 200
     data = resp.json()
-    assert data["status"] == "partial"
-    assert data["slack_sent"] is True
-    assert data["jira_issue_key"] is None
-    assert len(data["errors"]) == 1
+    assert [item["status"] for item in data] == ["processed", "failed", "processed", "failed"]
+    assert data[1]["errors"] == [f"invalid event: event: line exceeds {settings.ndjson_max_line_bytes} bytes"]
+    assert data[3]["errors"] == ["internal error"]
+    assert data[3]["job_id"] == 44
+
+
+async def test_unified_webhook_dispatches_on_event_type(client, mocked_clients):
+    mock_jira, _ = mocked_clients
+
+    resp = await client.post("/api/v1/webhooks", json=SAMPLE_EVENT)
+    unknown = await client.post("/api/v1/webhooks", json={**SAMPLE_EVENT, "event_type": "pr_closed"})
+
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "processed"
+    assert mock_jira.create_issue.call_count == 1
+    assert unknown.status_code == 422
+
+
+async def test_invalid_payload_is_rejected_with_422(client):
+    resp = await client.post("/api/v1/webhooks/pr-opened", json={**SAMPLE_EVENT, "job_id": "not-a-number"})
+    malformed = await client.post(
+        "/api/v1/webhooks/pr-opened",
+        content=b"{not json",
+        headers={"Content-Type": "application/json"},
+    )
 
+    assert resp.status_code == 422
+    assert resp.json()["detail"][0]["loc"] == ["body", "job_id"]
+    assert malformed.status_code == 422
 
-async def test_health_endpoint():
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as client:
-        resp = await client.get("/health")
+
+async def test_health_endpoint(client):
+    resp = await client.get("/health")
     assert resp.status_code == 200
     assert resp.json()["status"] == "ok"
+
+
+async def test_openapi_documents_422_for_every_webhook_route(client):
+    spec = (await client.get("/openapi.json")).json()
+
+    webhook_posts = {path: item["post"] for path, item in spec["paths"].items() if "post" in item}
+
+    assert len(webhook_posts) == 5
+    assert all("422" in operation["responses"] for operation in webhook_posts.values())
+
+
+def _refs(node):
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "$ref" or (key == "mapping" and isinstance(value, dict)):
+                yield from ([value] if key == "$ref" else value.values())
+            else:
+                yield from _refs(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _refs(item)
+
+
+async def test_openapi_refs_resolve(client):
+    """Every $ref, including the unified route's discriminator mapping, names a component."""
+    spec = (await client.get("/openapi.json")).json()
+    components = spec["components"]["schemas"]
+
+    refs = set(_refs(spec))
+
+    assert "#/components/schemas/RecoveryCompleteEvent" in refs
+    assert all(ref.removeprefix("#/components/schemas/") in components for ref in refs)
+
+
+async def test_pr_opened_batch_reports_claim_and_send_failures_per_event(client, mocked_clients, monkeypatch):
+    mock_jira, _ = mocked_clients
+    claim_idempotency = event_handler.claim_idempotency
+    send_pr_opened = event_handler._send_pr_opened
+
+    async def _claim(db, key, event, *, job_id):
+        if job_id == 43:
+            raise RuntimeError("database is locked")
+        return await claim_idempotency(db, key, event, job_id=job_id)
+
+    async def _send(event, jira, slack):
+        if event.job_id == 44:
+            raise RuntimeError("template bug")
+        return await send_pr_opened(event, jira, slack)
+
+    monkeypatch.setattr(event_handler, "claim_idempotency", _claim)
+    monkeypatch.setattr(event_handler, "_send_pr_opened", _send)
+
+    resp = await client.post(
+        "/api/v1/webhooks/pr-opened/batch",
+        json=[SAMPLE_EVENT, {**SAMPLE_EVENT, "job_id": 43}, {**SAMPLE_EVENT, "job_id": 44}],
+    )
+
+    data = resp.json()
+    assert [item["status"] for item in data] == ["processed", "failed", "failed"]
+    assert data[1]["errors"] == ["claim: database is locked"]
+    assert data[2]["errors"] == ["template bug"]
+    assert mock_jira.create_issue.call_count == 1
+    # Only the delivered event keeps its claim; the other two can be retried.
+    async with async_session() as db:
+        assert (await db.scalars(select(NotificationEvent.job_id))).all() == [42]